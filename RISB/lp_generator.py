@@ -1,8 +1,12 @@
 import itertools
+import json
 import networkx as nx
-import cvxpy as cp
+import numpy as np
 import os
-from itertools import chain, combinations
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from scipy import sparse
+from scipy.optimize import linprog, OptimizeResult
+from itertools import combinations
 from tabulate import tabulate
 from datetime import datetime
 
@@ -18,12 +22,22 @@ def set_logfile(path: str):
         logfile.close()
     logfile = open(path, "w", encoding="utf-8")
 
-def logprint(*args, to_log=True, to_terminal=True, **kwargs):
-    """Print to terminal and/or logfile."""
+def logprint(*args, to_log=True, to_terminal=True, log=None, **kwargs):
+    """Print to terminal and/or log (by default, the file set with set_logfile)."""
+    log = log or logfile
     if to_terminal:
         print(*args, **kwargs, flush=True)
-    if to_log and logfile:
-        print(*args, **kwargs, file=logfile, flush=True)
+    if to_log and log:
+        print(*args, **kwargs, file=log, flush=True)
+
+def case_logger(log=None, verbose: bool = True):
+    """
+    Returns a logprint writing to the given log file (instead of the one set with set_logfile),
+    and to the terminal only if verbose.
+    """
+    def case_logprint(*args, to_log=True, to_terminal=True, **kwargs):
+        logprint(*args, to_log=to_log, to_terminal=to_terminal and verbose, log=log, **kwargs)
+    return case_logprint
 
 # -----------------------
 # Graph utilities
@@ -44,35 +58,51 @@ def compute_info_sets_all_choices(G: nx.DiGraph):
     """
     Computes the possible knowledge sets receivable through information sharing by each agent
     in G.
+
+    Agents choose in topological order, so an agent's knowledge set is final when its turn comes
+    and is recorded then. Tokens are interned as bits (each agent's knowledge set is a bitmask),
+    states are explored depth-first with undo-based backtracking instead of copying, and a state
+    (the next agent and the knowledge sets of the agents still to choose) is only expanded the
+    first time it is reached.
     """
-    G = G.copy()
     topo_order = list(nx.topological_sort(G))
-    initial_state = {i: (frozenset(), None) for i in topo_order}
-    all_info_sets = {i: set() for i in topo_order}
-    queue = [initial_state]
-
-    while queue:
-        state = queue.pop()
-        next_agent = next((i for i in topo_order if state[i][1] is None), None)
-        if next_agent is None:
-            for i in topo_order:
-                all_info_sets[i].add(tuple(sorted(state[i][0])))
-            continue
-
-        knowledge_set = set(state[next_agent][0])
-        own_choice_token = ("OWN", next_agent, tuple(sorted(knowledge_set)))
-        possible_choices = sorted(
-            list(knowledge_set) + [own_choice_token],
-            key=lambda x: (str(type(x)), str(x))
-        )
-
-        for choice in possible_choices:
-            new_state = {k: (set(v[0]), v[1]) for k, v in state.items()}
-            new_state[next_agent] = (set(knowledge_set), choice)
-            for nbr in sorted(G.successors(next_agent)):
-                new_state[nbr][0].add(choice)
-            new_state = {k: (frozenset(v[0]), v[1]) for k, v in new_state.items()}
-            queue.append(new_state)
+    position = {agent: k for k, agent in enumerate(topo_order)}
+    successors = [[position[nbr] for nbr in sorted(G.successors(agent))] for agent in topo_order]
+    knowledge = [0] * len(topo_order)
+    masks = [set() for _ in topo_order]
+    token_ids, tokens = {}, []
+    visited = set()
+
+    def own_token(k: int, mask: int) -> int:
+        token = token_ids.get((k, mask))
+        if token is None:
+            token = token_ids[(k, mask)] = len(tokens)
+            tokens.append(("OWN", topo_order[k], tuple(sorted(tokens[t] for t in _bits(mask)))))
+        return token
+
+    def explore(k: int):
+        if k == len(topo_order):
+            return
+        state = (k, *knowledge[k:])
+        if state in visited:
+            return
+        visited.add(state)
+        mask = knowledge[k]
+        masks[k].add(mask)
+        for token in [*_bits(mask), own_token(k, mask)]:
+            bit = 1 << token
+            added = [nbr for nbr in successors[k] if not knowledge[nbr] & bit]
+            for nbr in added:
+                knowledge[nbr] |= bit
+            explore(k + 1)
+            for nbr in added:
+                knowledge[nbr] ^= bit
+
+    explore(0)
+    all_info_sets = {
+        agent: {tuple(sorted(tokens[t] for t in _bits(mask))) for mask in masks[k]}
+        for k, agent in enumerate(topo_order)
+    }
 
     greedy_vars = {}
     for agent in topo_order:
@@ -92,10 +122,60 @@ def compute_info_sets_all_choices(G: nx.DiGraph):
 
     return final_info_sets
 
+def _bits(mask: int):
+    """Yields the indices of the set bits of mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
 # -----------------------
 # LP solver
 # -----------------------
-def build_and_solve_lp(G: nx.DiGraph, pruned: bool = False, info_sets=None):
+# HiGHS interior point (with crossover) solves these LPs several times faster than its simplex solvers
+LP_METHOD = "highs-ipm"
+
+# Status names of scipy.optimize.linprog result codes
+LP_STATUSES = {0: "optimal", 1: "iteration_limit", 2: "infeasible", 3: "unbounded", 4: "numerical_issues"}
+
+# Row generation adds at most CUTS_PER_ROUND of the submodularity constraints violated by more
+# than CUT_TOLERANCE in each round
+CUTS_PER_ROUND = 1000
+CUT_TOLERANCE = 1e-9
+# The rounds of row generation slow down as the rows pile up: on the 4-agent graphs, it beat the full
+# LP on the LPs of up to 11 elements (28160 distinct submodularity constraints), but took 1-5 times
+# as long on every larger one. LPs with more distinct submodularity constraints than
+# ROW_GENERATION_MAX_CANDIDATES are solved in full instead.
+ROW_GENERATION_MAX_CANDIDATES = 30000
+
+# Model statuses of highspy (by name) as scipy.optimize.linprog result codes
+HIGHS_STATUSES = {"kOptimal": 0, "kIterationLimit": 1, "kTimeLimit": 1, "kInfeasible": 2, "kUnbounded": 3}
+
+# Coefficients of the submodularity rows f(A + x + y) + f(A) - f(A + x) - f(A + y) <= 0
+SUBMODULARITY_COEFFICIENTS = (1, 1, -1, -1)
+
+def build_and_solve_lp(
+    G: nx.DiGraph,
+    pruned: bool = False,
+    info_sets=None,
+    row_generation: bool = False,
+    log=None,
+    verbose: bool = True
+):
+    """
+    Builds and solves the worst-case greedy efficiency LP of G (see LPGEN_EXPLAINER.md).
+
+    With row_generation, the LP is first solved without the submodularity constraints, and
+    the submodularity constraints violated by the current solution are added and the LP solved
+    again (warm-started from the previous basis) until none are violated. The final solution
+    satisfies every constraint of the full LP, so its z is the same. LPs with more than
+    ROW_GENERATION_MAX_CANDIDATES distinct submodularity constraints are solved in full, as row
+    generation is slower on them. Row generation needs highspy.
+
+    The details are written to log (an open file) or, if it is None, to the file set with
+    set_logfile. Progress is only printed to the terminal if verbose.
+    """
+    logprint = case_logger(log, verbose)
     logprint(f"START TIME: {datetime.now().strftime('%m-%d-%Y %I:%M:%S %p')}")
     G = G.copy()
     mode_str = "PRUNED" if pruned else "FULL"
@@ -127,119 +207,319 @@ def build_and_solve_lp(G: nx.DiGraph, pruned: bool = False, info_sets=None):
         all_vars.add(opt_vars[i])
     all_vars = sorted(all_vars)
 
-    subsets_to_iterate = None
+    # Subsets of the ground set are int masks, where bit b stands for all_vars[b]. As all_vars
+    # is sorted, ordering masks by their bit positions orders them as the sorted variable names.
+    bit = {var: b for b, var in enumerate(all_vars)}
+    ground_size = len(all_vars)
+
+    def mask_of(*names):
+        mask = 0
+        for name in names:
+            mask |= 1 << bit[name]
+        return mask
+
     if pruned:
-        feasible_profiles = list(itertools.product(
-            *[list(greedy_vars[i].values()) + [opt_vars[i]] for i in topo_order]
-        ))
-        feasible_subsets = sorted(
-            {frozenset(sub) for profile in feasible_profiles for r in range(len(profile) + 1)
-             for sub in itertools.combinations(profile, r)},
-            key=lambda s: (len(s), sorted(s))
-        )
-        subsets_to_iterate = feasible_subsets
+        # Subsets of feasible profiles hold at most one variable from each agent's action class
+        feasible_subsets = {0}
+        for i in topo_order:
+            choices = [mask_of(var) for var in greedy_vars[i].values()] + [mask_of(opt_vars[i])]
+            feasible_subsets |= {subset | choice for subset in feasible_subsets for choice in choices}
+        subsets_to_iterate = sorted(feasible_subsets, key=lambda s: (bin(s).count("1"), list(_bits(s))))
     else:
-        subsets_to_iterate = list(chain.from_iterable(combinations(all_vars, r) for r in range(len(all_vars) + 1)))
+        subsets_to_iterate = [
+            mask_of(*(all_vars[b] for b in combo))
+            for r in range(ground_size + 1) for combo in combinations(range(ground_size), r)
+        ]
 
-    subset_indices = {frozenset(s): idx for idx, s in enumerate(subsets_to_iterate)}
-    f = cp.Variable(len(subsets_to_iterate))
-    z = cp.Variable()
+    subset_indices = {s: idx for idx, s in enumerate(subsets_to_iterate)}
+    # LP columns: f(S) for each subset S (in the order of subsets_to_iterate), then z
+    z_col = len(subsets_to_iterate)
 
-    def fval(*args):
-        return f[subset_indices[frozenset(args)]]
+    def fcol(*args):
+        return subset_indices[mask_of(*args)]
 
     logprint(" done!", to_log=False)
     logprint(f"\nElements in Ground Set: {len(all_vars)}")
     logprint(f"Ground Set: {all_vars}", to_terminal=False)
     logprint(f"Total Variable Count: {len(subsets_to_iterate) + 1}", to_log=False)
 
+    if row_generation:
+        candidate_count = sum(
+            len(columns) for columns in _iter_submodularity_candidates(subsets_to_iterate, subset_indices, ground_size)
+        )
+        if candidate_count > ROW_GENERATION_MAX_CANDIDATES:
+            logprint(
+                f"{candidate_count} distinct submodularity constraints (more than {ROW_GENERATION_MAX_CANDIDATES}), "
+                "solving the full LP instead of generating rows."
+            )
+            row_generation = False
+
     # Constraint Generation (see LPGEN_EXPLAINER.md for more details)
-    constraints, counts = [], {}
-    counts["Maximizing Greedy Locally"] = 0
+    # Each family of inequalities is a block of rows sharing a coefficient pattern: the
+    # columns of row r are columns[r] and its coefficients are coefficients, so that the row
+    # reads coefficients @ x[columns[r]] <= 0.
+    blocks, counts = {}, {}
+    local_greedy = []
     for i in topo_order:
         for ks, gvar in greedy_vars[i].items():
-            constraints.append(fval(gvar, *ks) >= fval(opt_vars[i], *ks))
-            counts["Maximizing Greedy Locally"] += 1
+            local_greedy.append((fcol(opt_vars[i], *ks), fcol(gvar, *ks)))
             for other_g in greedy_vars[i].values():
                 if other_g != gvar:
-                    constraints.append(fval(gvar, *ks) >= fval(other_g, *ks))
-                    counts["Maximizing Greedy Locally"] += 1
-
-    counts["Optimality"] = 0
-    opt_profile = frozenset([opt_vars[i] for i in topo_order])
-    constraints.append(f[subset_indices[opt_profile]] == 1)
-    for s in subset_indices.keys():
-        if s != opt_profile:
-            constraints.append(f[subset_indices[opt_profile]] >= f[subset_indices[s]])
-            counts["Optimality"] += 1
-
-    counts["Minimizing Greedy Globally"] = 0
-    for combo in itertools.product(*[list(greedy_vars[i].values()) for i in topo_order]):
-        constraints.append(z >= f[subset_indices[frozenset(combo)]])
-        counts["Minimizing Greedy Globally"] += 1
-
-    counts["Submodularity"] = 0
-    for A in subset_indices:
-        for x in all_vars:
-            if x in A:
-                continue
-            Ax = frozenset(set(A) | {x})
-            if Ax not in subset_indices:
-                continue
-            for y in all_vars:
-                if y in A or y == x:
-                    continue
-                By = set(A) | {y}
-                Byx = frozenset(By | {x})
-                if frozenset(By) not in subset_indices or Byx not in subset_indices:
-                    continue
-                constraints.append(f[subset_indices[Ax]] + f[subset_indices[frozenset(By)]] 
-                                   >= f[subset_indices[Byx]] + f[subset_indices[A]])
-                counts["Submodularity"] += 1
-
-    counts["Monotonicity"] = 0
-    for A in subset_indices:
-        for x in all_vars:
-            if x in A:
-                continue
-            B = frozenset(set(A) | {x})
-            if B not in subset_indices:
-                continue
-            constraints.append(f[subset_indices[B]] >= f[subset_indices[A]])
-            counts["Monotonicity"] += 1
-
-    constraints.append(f[subset_indices[frozenset()]] == 0)
+                    local_greedy.append((fcol(other_g, *ks), fcol(gvar, *ks)))
+    blocks["Maximizing Greedy Locally"] = (local_greedy, (1, -1))
+
+    opt_index = fcol(*(opt_vars[i] for i in topo_order))
+    blocks["Optimality"] = ([(idx, opt_index) for idx in range(z_col) if idx != opt_index], (1, -1))
+
+    blocks["Minimizing Greedy Globally"] = (
+        [(fcol(*combo), z_col) for combo in itertools.product(*[list(greedy_vars[i].values()) for i in topo_order])],
+        (1, -1)
+    )
+    if row_generation:
+        # Filled in lazily (see _solve_lp_row_generation)
+        blocks["Submodularity"] = (np.empty((0, 4), dtype=np.int64), SUBMODULARITY_COEFFICIENTS)
+    else:
+        blocks["Submodularity"] = (_submodularity_columns(subset_indices, ground_size), SUBMODULARITY_COEFFICIENTS)
+    blocks["Monotonicity"] = (_monotonicity_columns(subset_indices, ground_size), (1, -1))
+    for family, (columns, _) in blocks.items():
+        counts[family] = len(columns)
+
+    # f(optimal profile) = 1 and f(empty set) = 0
+    A_eq = sparse.coo_matrix(([1.0, 1.0], ([0, 1], [opt_index, subset_indices[0]])), shape=(2, z_col + 1))
+    b_eq = np.array([1.0, 0.0])
     counts["Normalization"] = 1
-
-    logprint(f"Total Constraint Count: {len(constraints)}", to_log=False)
+    constraint_count = sum(counts.values()) + 1
 
     # Solve
-    logprint("\nCreating problem...", to_log=False, end="")
-    problem = cp.Problem(cp.Minimize(z), constraints)
-    logprint(" done!", to_log=False)
-
-    logprint("Solving problem...", to_log=False, end="")
-    problem.solve(solver=cp.GLPK)
-    logprint(" done!", to_log=False)
+    if row_generation:
+        logprint(f"Total Constraint Count: {constraint_count} before row generation", to_log=False)
+        logprint(f"Submodularity Constraint Candidates: {candidate_count}", to_log=False)
+        result, added = _solve_lp_row_generation(
+            blocks, A_eq, b_eq, z_col,
+            lambda: _iter_submodularity_candidates(subsets_to_iterate, subset_indices, ground_size), logprint
+        )
+        counts["Submodularity"] = added
+        constraint_count += added
+        # Each inequality appears twice in the full LP, once for (x, y) and once for (y, x)
+        logprint(
+            f"Submodularity constraints added: {added} of {candidate_count} distinct "
+            f"({2 * candidate_count} in the full LP)", to_terminal=False
+        )
+    else:
+        logprint(f"Total Constraint Count: {constraint_count}", to_log=False)
+        result = _solve_lp(blocks, A_eq, b_eq, z_col, logprint)
+    z_value = result.x[z_col] if result.status == 0 else None
 
     # Results
     logprint("\n- LP SUMMARY -", to_terminal=False)
     logprint(f"Variables: {len(subset_indices) + 1}", to_terminal=False)
-    logprint(f"Constraints: {len(constraints)}", to_terminal=False)
+    logprint(f"Constraints: {constraint_count}", to_terminal=False)
     logprint(tabulate(counts.items(), headers=["Constraint Type", "Count"], tablefmt="simple"), to_terminal=False)
 
     logprint("\n- RESULTS -")
-    logprint("Status:", problem.status)
-    logprint("z =", z.value)
+    logprint("Status:", LP_STATUSES.get(result.status, result.message))
+    logprint("z =", z_value)
     logprint("See log file for function definition and more details.", to_log=False)
 
-    logprint("\n- FUNCTION DEFINITION -", to_terminal=False)
-    for s in subset_indices.keys():
-        val = f[subset_indices[frozenset(s)]].value
-        logprint(f"f({set(s)}) = {val:.5f}", to_terminal=False)
+    if z_value is not None:
+        logprint("\n- FUNCTION DEFINITION -", to_terminal=False)
+        for s, idx in subset_indices.items():
+            logprint(f"f({ {all_vars[b] for b in _bits(s)} }) = {result.x[idx]:.5f}", to_terminal=False)
 
     logprint(f"END TIME: {datetime.now().strftime('%m-%d-%Y %I:%M:%S %p')}\n")
-    return z.value, info_sets
+    return z_value, info_sets
+
+def _solve_lp(blocks: dict, A_eq: sparse.coo_matrix, b_eq: np.ndarray, z_col: int, logprint=logprint):
+    """Minimizes z subject to the inequality blocks and the equality rows."""
+    logprint("\nCreating problem...", to_log=False, end="")
+    A_ub = sparse.vstack(
+        [_coo_rows(columns, coefficients, z_col + 1) for columns, coefficients in blocks.values()], format="csr"
+    )
+    cost = np.zeros(z_col + 1)
+    cost[z_col] = 1.0
+    logprint(" done!", to_log=False)
+
+    logprint("Solving problem...", to_log=False, end="")
+    result = linprog(
+        cost, A_ub=A_ub, b_ub=np.zeros(A_ub.shape[0]), A_eq=A_eq, b_eq=b_eq, bounds=(None, None), method=LP_METHOD
+    )
+    logprint(" done!", to_log=False)
+    return result
+
+def _solve_lp_row_generation(
+    blocks: dict, A_eq: sparse.coo_matrix, b_eq: np.ndarray, z_col: int, candidate_chunks, logprint=logprint
+):
+    """
+    Minimizes z subject to the inequality blocks, the equality rows and the submodularity rows
+    yielded (as column quadruples, in chunks) by candidate_chunks(), adding the violated rows in
+    rounds to a single HiGHS model. The candidates are generated again for each round, so that
+    only the most violated rows of a round are held at once. The first solve uses the interior
+    point method (as LP_METHOD), the following ones the dual simplex method warm-started from the
+    previous basis. Returns the result (as linprog would) and the number of rows added.
+    """
+    import highspy  # Only row generation needs highspy
+
+    logprint("\nCreating problem...", to_log=False, end="")
+    column_count = z_col + 1
+    cost = np.zeros(column_count)
+    cost[z_col] = 1.0
+    highs = highspy.Highs()
+    highs.setOptionValue("output_flag", False)
+    highs.addCols(
+        column_count, cost, np.full(column_count, -highspy.kHighsInf), np.full(column_count, highspy.kHighsInf),
+        0, np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32), np.empty(0)
+    )
+    A_ub = sparse.vstack(
+        [_coo_rows(columns, coefficients, column_count) for columns, coefficients in blocks.values()], format="csr"
+    )
+    _add_highs_rows(highs, A_ub, np.full(A_ub.shape[0], -highspy.kHighsInf), np.zeros(A_ub.shape[0]))
+    _add_highs_rows(highs, sparse.csr_matrix(A_eq), b_eq, b_eq)
+    highs.setOptionValue("solver", "ipm")
+    logprint(" done!", to_log=False)
+
+    coefficients = np.asarray(SUBMODULARITY_COEFFICIENTS, dtype=float)
+    # A distinct submodularity row is identified by its A + x + y and A columns. The keys of the
+    # rows in the model are kept sorted, as the solver may leave them violated within its tolerance.
+    added_keys = np.empty(0, dtype=np.int64)
+    for round_idx in itertools.count(1):
+        logprint("Solving problem...", to_log=False, end="")
+        highs.run()
+        logprint(" done!", to_log=False)
+        status = HIGHS_STATUSES.get(highs.getModelStatus().name, 4)
+        if status != 0:
+            break
+        x = np.asarray(highs.getSolution().col_value)
+        cuts = _most_violated_rows(x, candidate_chunks(), coefficients, added_keys, column_count)
+        logprint(
+            f"Row generation round {round_idx}: z = {x[z_col]:.6f}, {len(cuts)} violated submodularity "
+            f"constraints added ({len(added_keys)} active)"
+        )
+        if not len(cuts):
+            break
+        added_keys = np.sort(np.concatenate((added_keys, cuts[:, 0] * column_count + cuts[:, 1])))
+        rows = _coo_rows(cuts, SUBMODULARITY_COEFFICIENTS, column_count).tocsr()
+        _add_highs_rows(highs, rows, np.full(len(cuts), -highspy.kHighsInf), np.zeros(len(cuts)))
+        # Devex pricing, as recomputing the dual steepest edge weights of a warm start costs more
+        # than the few iterations a round needs
+        highs.setOptionValue("solver", "simplex")
+        highs.setOptionValue("simplex_dual_edge_weight_strategy", 1)
+
+    result = OptimizeResult(
+        x=np.asarray(highs.getSolution().col_value), status=status,
+        message=highs.modelStatusToString(highs.getModelStatus())
+    )
+    return result, len(added_keys)
+
+def _most_violated_rows(x: np.ndarray, chunks, coefficients: np.ndarray, added_keys: np.ndarray, column_count: int):
+    """
+    Returns the column quadruples of (at most CUTS_PER_ROUND of) the submodularity rows in chunks
+    that x violates by more than CUT_TOLERANCE and whose keys are not in added_keys, most violated
+    first.
+    """
+    cuts, violation = np.empty((0, 4), dtype=np.int64), np.empty(0)
+    for columns in chunks:
+        chunk_violation = x[columns] @ coefficients
+        violated = np.flatnonzero(chunk_violation > CUT_TOLERANCE)
+        if not len(violated):
+            continue
+        if len(added_keys):
+            keys = columns[violated, 0] * column_count + columns[violated, 1]
+            positions = np.minimum(np.searchsorted(added_keys, keys), len(added_keys) - 1)
+            violated = violated[added_keys[positions] != keys]
+        cuts = np.concatenate((cuts, columns[violated]))
+        violation = np.concatenate((violation, chunk_violation[violated]))
+        if len(cuts) > CUTS_PER_ROUND:
+            kept = np.argpartition(-violation, CUTS_PER_ROUND)[:CUTS_PER_ROUND]
+            cuts, violation = cuts[kept], violation[kept]
+    order = np.argsort(-violation, kind="stable")
+    return cuts[order]
+
+def _add_highs_rows(highs, rows: sparse.csr_matrix, lower: np.ndarray, upper: np.ndarray):
+    """Adds the rows lower <= rows @ x <= upper to a highspy model."""
+    highs.addRows(
+        rows.shape[0], lower, upper, rows.nnz, rows.indptr[:-1].astype(np.int32), rows.indices.astype(np.int32),
+        rows.data.astype(float)
+    )
+
+def _monotonicity_columns(subset_indices: dict, ground_size: int) -> np.ndarray:
+    """Returns the (A, A + x) column pairs of the rows f(A) - f(A + x) <= 0."""
+    columns = []
+    for A, a_idx in subset_indices.items():
+        for b in range(ground_size):
+            if not A >> b & 1:
+                ax_idx = subset_indices.get(A | 1 << b)
+                if ax_idx is not None:
+                    columns += (a_idx, ax_idx)
+    return np.array(columns, dtype=np.int64).reshape(-1, 2)
+
+def _submodularity_columns(subset_indices: dict, ground_size: int) -> np.ndarray:
+    """
+    Returns the (A + x + y, A, A + x, A + y) column quadruples of the submodularity rows (see
+    SUBMODULARITY_COEFFICIENTS), for every subset A and ordered pair x != y outside of it.
+    """
+    chunks = list(_iter_submodularity_columns(subset_indices, ground_size))
+    return np.concatenate(chunks) if chunks else np.empty((0, 4), dtype=np.int64)
+
+def _iter_submodularity_columns(
+    subset_indices: dict, ground_size: int, unordered: bool = False, chunk_rows: int = 100000
+):
+    """
+    Yields the column quadruples of _submodularity_columns in chunks of about chunk_rows rows.
+    The rows of (x, y) and (y, x) are the same inequality; with unordered, only x < y is kept.
+    """
+    columns = []
+    for A, a_idx in subset_indices.items():
+        free = [1 << b for b in range(ground_size) if not A >> b & 1]
+        for x in free:
+            ax_idx = subset_indices.get(A | x)
+            if ax_idx is None:
+                continue
+            for y in free:
+                if y == x or unordered and y < x:
+                    continue
+                by_idx = subset_indices.get(A | y)
+                byx_idx = subset_indices.get(A | y | x)
+                if by_idx is None or byx_idx is None:
+                    continue
+                columns += (byx_idx, a_idx, ax_idx, by_idx)
+        if len(columns) >= 4 * chunk_rows:
+            yield np.array(columns, dtype=np.int64).reshape(-1, 4)
+            columns = []
+    if columns:
+        yield np.array(columns, dtype=np.int64).reshape(-1, 4)
+
+def _iter_submodularity_candidates(subsets_to_iterate: list, subset_indices: dict, ground_size: int):
+    """
+    Yields the column quadruples of the distinct submodularity rows (the rows of
+    _submodularity_columns with x < y), one pair (x, y) at a time. The subsets are looked up as an
+    int64 array; ground sets of more than 62 elements fall back to the Python enumeration.
+    """
+    if ground_size > 62:
+        yield from _iter_submodularity_columns(subset_indices, ground_size, unordered=True)
+        return
+
+    masks = np.array(subsets_to_iterate, dtype=np.int64)
+    order = np.argsort(masks)
+    sorted_masks = masks[order]
+
+    def indices_of(queries):
+        # Column of each mask in queries, -1 where the subset is not a column
+        positions = np.minimum(np.searchsorted(sorted_masks, queries), len(sorted_masks) - 1)
+        return np.where(sorted_masks[positions] == queries, order[positions], -1)
+
+    for x_bit, y_bit in combinations(range(ground_size), 2):
+        x, y = 1 << x_bit, 1 << y_bit
+        a_idx = np.flatnonzero(masks & (x | y) == 0)
+        ax_idx, by_idx, byx_idx = (indices_of(masks[a_idx] | added) for added in (x, y, x | y))
+        found = (ax_idx >= 0) & (by_idx >= 0) & (byx_idx >= 0)
+        yield np.column_stack((byx_idx[found], a_idx[found], ax_idx[found], by_idx[found]))
+
+def _coo_rows(columns, coefficients: tuple, column_count: int) -> sparse.coo_matrix:
+    """Returns the rows coefficients @ x[columns[r]] of a constraint block as a COO matrix."""
+    columns = np.asarray(columns, dtype=np.int64).reshape(-1, len(coefficients))
+    rows = np.repeat(np.arange(len(columns)), len(coefficients))
+    data = np.tile(np.asarray(coefficients, dtype=float), len(columns))
+    return sparse.coo_matrix((data, (rows, columns.ravel())), shape=(len(columns), column_count))
 
 # -----------------------
 # Batch solver utilities
@@ -248,24 +528,84 @@ def write_summary_table(headers: list, rows: list, path: str):
     with open(path, "w", encoding="utf-8") as f:
         print(tabulate(rows, headers=headers, tablefmt="simple"), file=f)
 
-def solve_lp_cases(graph_set: list[nx.DiGraph], mode: str, output_dir: str):
-    """Solve LPs for a set of graphs. mode: 'full', 'pruned', or 'both'."""
+def solve_lp_cases(
+    graph_set: list[nx.DiGraph],
+    mode: str,
+    output_dir: str,
+    row_generation: bool = False,
+    workers: int = 1
+):
+    """
+    Solve LPs for a set of graphs. mode: 'full', 'pruned', or 'both'. With row_generation,
+    the submodularity constraints are added lazily (see build_and_solve_lp).
+
+    Each case writes its own log file, and its results are appended to manifest.jsonl in
+    output_dir as soon as it finishes. Cases already in the manifest are not solved again, so an
+    interrupted batch resumes with the missing (or failed) cases. With more than one worker, the
+    cases are solved in a process pool, one task per graph. The summary/comparison table is written from the manifest.
+    """
+    if mode not in ("full", "pruned", "both"):
+        raise ValueError(f"Unknown mode '{mode}'. Options are 'full', 'pruned' and 'both'.")
     os.makedirs(output_dir, exist_ok=True)
     total_cases = len(graph_set)
-    print(f"Building and solving {mode.upper()} LPs for {total_cases} graphs...\n")
-    results = {"full": {}, "pruned": {}}
-
-    for idx, g in enumerate(graph_set, start=1):
-        print(f"- - - CASE {idx} / {total_cases} - - -")
-        info_sets = compute_info_sets_all_choices(g)
-
-        if mode in ("full", "both"):
-            set_logfile(f"{output_dir}/full_case{idx}.log" if mode == "both" else f"{output_dir}/case{idx}.log")
-            results["full"][idx], _ = build_and_solve_lp(g, pruned=False, info_sets=info_sets)
-
-        if mode in ("pruned", "both"):
-            set_logfile(f"{output_dir}/pruned_case{idx}.log" if mode == "both" else f"{output_dir}/case{idx}.log")
-            results["pruned"][idx], _ = build_and_solve_lp(g, pruned=True, info_sets=info_sets)
+    variants = ["full", "pruned"] if mode == "both" else [mode]
+    manifest_path = os.path.join(output_dir, "manifest.jsonl")
+    results = read_manifest(manifest_path, graph_set)
+
+    # One task per graph, so that its info sets are computed once for all of its variants
+    pending = {
+        idx: [variant for variant in variants if results[variant].get(idx) is None]
+        for idx in range(1, total_cases + 1)
+    }
+    pending = {idx: case_variants for idx, case_variants in pending.items() if case_variants}
+    left = sum(len(case_variants) for case_variants in pending.values())
+    print(f"Building and solving {mode.upper()} LPs for {total_cases} graphs...")
+    if left < total_cases * len(variants):
+        print(f"Resuming from [{manifest_path}]: {left} of {total_cases * len(variants)} LPs left to solve.")
+    print()
+
+    def case_args(idx):
+        log_paths = [
+            os.path.join(output_dir, f"{variant}_case{idx}.log" if mode == "both" else f"case{idx}.log")
+            for variant in pending[idx]
+        ]
+        return graph_set[idx - 1], pending[idx], log_paths, row_generation
+
+    with open(manifest_path, "a", encoding="utf-8") as manifest:
+        if manifest.tell() and not _ends_with_newline(manifest_path):
+            # Terminate a line left incomplete by an interrupted batch
+            manifest.write("\n")
+
+        def record(idx, case_results):
+            for variant, z in zip(pending[idx], case_results):
+                results[variant][idx] = z
+                if z is None:
+                    # Failed solves are not recorded, so that they are retried when the batch is resumed
+                    continue
+                entry = {"case": idx, "variant": variant, "z": z, "edges": _edge_list(graph_set[idx - 1])}
+                manifest.write(json.dumps(entry) + "\n")
+            manifest.flush()
+            os.fsync(manifest.fileno())
+
+        if workers <= 1:
+            for idx in pending:
+                print(f"- - - CASE {idx} / {total_cases} - - -")
+                record(idx, _solve_case(*case_args(idx), verbose=True))
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            futures = {}
+            try:
+                futures = {pool.submit(_solve_case, *case_args(idx)): idx for idx in pending}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    idx = futures[future]
+                    record(idx, future.result())
+                    solved = ", ".join(f"{variant} z = {results[variant][idx]}" for variant in pending[idx])
+                    print(f"[{done} / {len(pending)}] Case {idx}: {solved}")
+            finally:
+                # Cases that have not started are dropped if the batch is interrupted
+                for future in futures:
+                    future.cancel()
+                pool.shutdown()
 
     if mode == "both":
         write_summary_table(
@@ -283,8 +623,58 @@ def solve_lp_cases(graph_set: list[nx.DiGraph], mode: str, output_dir: str):
     print(f"\nFinished! See [{output_dir}] for detailed results.\n")
     return results
 
+def read_manifest(path: str, graph_set: list[nx.DiGraph]) -> dict:
+    """
+    Reads the results recorded in a manifest as {"full": {case: z}, "pruned": {case: z}}. A line
+    left incomplete by an interrupted batch, or recording a failed solve (z = None), is ignored. Raises a ValueError if an entry was
+    recorded for a different graph than the one at its position in graph_set.
+    """
+    results = {"full": {}, "pruned": {}}
+    if not os.path.exists(path):
+        return results
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            idx = entry["case"]
+            if idx > len(graph_set) or entry["edges"] != _edge_list(graph_set[idx - 1]):
+                raise ValueError(f"Manifest [{path}] holds a result for a different case {idx}.")
+            if entry["z"] is not None:
+                results[entry["variant"]][idx] = entry["z"]
+    return results
+
+def _solve_case(
+    G: nx.DiGraph, variants: list, log_paths: list, row_generation: bool, verbose: bool = False
+) -> list:
+    """
+    Solves the given variants ('full' or 'pruned') of one case, writing the details of each to
+    its log path, and returns their z (None if not solved). The info sets are computed once.
+    """
+    info_sets = compute_info_sets_all_choices(G)
+    case_results = []
+    for variant, log_path in zip(variants, log_paths):
+        with open(log_path, "w", encoding="utf-8") as log:
+            z, _ = build_and_solve_lp(
+                G, pruned=variant == "pruned", info_sets=info_sets, row_generation=row_generation, log=log,
+                verbose=verbose
+            )
+        case_results.append(None if z is None else float(z))
+    return case_results
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+def _edge_list(G: nx.DiGraph) -> list:
+    return sorted([u, v] for u, v in G.edges())
+
 # -----------------------
 # Main
 # -----------------------
 if __name__ == "__main__":
-    solve_lp_cases(generate_all_graphs_of_size_n(3), mode="both", output_dir="RISB/3AgentGraphs")
\ No newline at end of file
+    solve_lp_cases(
+        generate_all_graphs_of_size_n(3), mode="both", output_dir="RISB/3AgentGraphs", workers=os.cpu_count() or 1
+    )
\ No newline at end of file
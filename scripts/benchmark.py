@@ -0,0 +1,270 @@
+# Benchmark suite for the optimal solvers, greedy algorithms, information sharing rules, scenario builders and the
+# RISB LP builder.
+#
+# Usage:
+#   python3 scripts/benchmark.py run --sizes small --output out/bench_baseline.json
+#   python3 scripts/benchmark.py compare out/bench_baseline.json out/bench_current.json --threshold 0.25
+#   python3 scripts/benchmark.py imports
+#
+# `compare` exits with status 1 if any benchmark's median time regressed by more than the threshold, and `imports`
+# exits with status 1 if importing a module takes longer than its budget or loads a deferred dependency.
+
+from __future__ import annotations
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable
+
+import networkx as nx
+import numpy as np
+from tabulate import tabulate
+
+from submodmax.objects.scenario import Scenario
+from submodmax.algorithms import distributed_greedy, greedy_with_information_sharing_rule
+from submodmax.information_sharing_rules import RULE_NAMES
+from submodmax.action_target_generators import default_target_generator, batch_target_generator
+from submodmax.scenario_builders import (
+    generate_line_graph, generate_random_linearized_dag, pass_to_last, pair_agents,
+    generate_random_dag_by_probability, generate_layered_dag, generate_k_out_dag
+)
+
+LP_GENERATOR_PATH = os.path.join(os.path.dirname(__file__), "..", "RISB", "lp_generator.py")
+
+# (agent count, target count, edge density) triples for each size preset. Edge density is the fraction of the
+# n(n - 1) / 2 possible edges of a linearized DAG that are present.
+SIZES = {
+    "small": [(5, 8, 0.3), (7, 10, 0.3)],
+    "medium": [(7, 10, 0.3), (20, 40, 0.2), (100, 200, 0.05)],
+    "large": [(20, 40, 0.2), (100, 200, 0.05), (500, 1000, 0.01)],
+}
+BRUTE_FORCE_MAX_AGENTS = 8
+LP_AGENT_COUNTS = {"small": [3], "medium": [3], "large": [3, 4]}
+SCENARIOS_PER_SIZE = 20
+
+# Import time budgets, as multiples of the time it takes to import IMPORT_BASELINE (measured first, in the same fresh
+# interpreter), so that they hold on slower machines, and the dependencies that must not be loaded by these imports
+# (they are only needed for figures, reports, matchings and centrality measures)
+IMPORT_BASELINE = "numpy"
+IMPORT_BUDGETS = {"submodmax.algorithms": 0.5, "submodmax.simulators": 1.0}
+DEFERRED_MODULES = ("matplotlib", "networkx", "tabulate", "scipy")
+IMPORT_SCRIPT = (
+    "import json, sys, time; start = time.perf_counter(); import {baseline}; baseline = time.perf_counter() - start; "
+    "start = time.perf_counter(); import {module}; elapsed = time.perf_counter() - start; "
+    "print(json.dumps([elapsed, baseline, sorted(m for m in {deferred} if m in sys.modules)]))"
+)
+
+def time_call(func: Callable[[], None], repeats: int) -> dict[str, float]:
+    """
+    Times `repeats` calls of `func` (after one warm-up call) and returns the median and min wall time in seconds.
+    """
+    func()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"median": statistics.median(times), "min": min(times), "repeats": repeats}
+
+def time_import(module: str, repeats: int) -> tuple[dict[str, float], list[str]]:
+    """
+    Times importing `module` in `repeats` fresh interpreters, after importing `IMPORT_BASELINE`. Returns the median and
+    min import time in seconds, the median time of the baseline import and the deferred modules that the import loaded.
+    """
+    times, baseline_times, loaded = [], [], []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [
+                sys.executable, "-c",
+                IMPORT_SCRIPT.format(baseline=IMPORT_BASELINE, module=module, deferred=DEFERRED_MODULES)
+            ],
+            capture_output=True, text=True, check=True
+        ).stdout
+        elapsed, baseline, loaded = json.loads(output)
+        times.append(elapsed)
+        baseline_times.append(baseline)
+    return {
+        "median": statistics.median(times), "min": min(times), "baseline": statistics.median(baseline_times),
+        "repeats": repeats
+    }, loaded
+
+def check_imports(repeats: int) -> tuple[dict[str, dict[str, float]], int]:
+    """
+    Times the import of every module in `IMPORT_BUDGETS` and prints whether it is within budget. Returns the timings
+    and the number of modules over budget or loading a deferred dependency.
+    """
+    results, failures = {}, 0
+    for module, budget in IMPORT_BUDGETS.items():
+        timing, loaded = time_import(module, repeats)
+        results[f"import/{module}"] = timing
+        limit = budget * timing["baseline"]
+        status = "ok" if timing["median"] <= limit else "OVER BUDGET"
+        if loaded:
+            status += f", loads {', '.join(loaded)}"
+        if status != "ok":
+            failures += 1
+        print(
+            f"import {module}: {timing['median']:.3f}s (budget {budget:.2f} x import {IMPORT_BASELINE} = "
+            f"{limit:.3f}s) {status}"
+        )
+    return results, failures
+
+def build_scenarios(agent_count: int, target_count: int, density: float, rng: random.Random) -> list[Scenario]:
+    edge_count = round(density * agent_count * (agent_count - 1) / 2)
+    return [
+        generate_random_linearized_dag(agent_count, target_count, edge_count, rng=rng)
+        for _ in range(SCENARIOS_PER_SIZE)
+    ]
+
+def clear_graph_metrics(scenarios: list[Scenario]) -> list[Scenario]:
+    """Drops the cached graph metrics of `scenarios` so that they are rebuilt by the next rule call."""
+    for s in scenarios:
+        s.graph_metrics = None
+    return scenarios
+
+def load_lp_generator():
+    spec = importlib.util.spec_from_file_location("lp_generator", LP_GENERATOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def run_benchmarks(sizes: str, repeats: int, seed: int) -> dict[str, dict[str, float]]:
+    results, _ = check_imports(repeats)
+    rng = random.Random(seed)
+
+    for agent_count, target_count, density in SIZES[sizes]:
+        size = f"n{agent_count}_m{target_count}_d{density}"
+        scenarios = build_scenarios(agent_count, target_count, density, rng)
+        print(f"Benchmarking size {size}...")
+
+        if agent_count <= BRUTE_FORCE_MAX_AGENTS:
+            results[f"brute_force_optimum/{size}"] = time_call(
+                lambda: [s.brute_force_optimal_solution() for s in scenarios], repeats
+            )
+        results[f"matching_optimum/{size}"] = time_call(
+            lambda: [s.matching_optimal_solution() for s in scenarios], repeats
+        )
+        results[f"distributed_greedy/{size}"] = time_call(
+            lambda: [distributed_greedy(s) for s in scenarios], repeats
+        )
+        for rule, rule_name in RULE_NAMES.items():
+            # The cached graph metrics are rebuilt on every repeat so that their cost is included
+            results[f"rule/{rule_name}/{size}"] = time_call(
+                lambda: [greedy_with_information_sharing_rule(s, rule, rng=rng) for s in clear_graph_metrics(scenarios)], repeats
+            )
+
+        edge_count = round(density * agent_count * (agent_count - 1) / 2)
+        builders = {
+            "generate_line_graph": lambda: generate_line_graph(agent_count, target_count, rng=rng),
+            "generate_random_linearized_dag": lambda: generate_random_linearized_dag(agent_count, target_count, edge_count, rng=rng),
+            "pass_to_last": lambda: pass_to_last(agent_count, target_count, rng=rng),
+            "pair_agents": lambda: pair_agents(agent_count, target_count, rng=rng),
+            "generate_random_dag_by_probability": lambda: generate_random_dag_by_probability(agent_count, target_count, density, rng=rng),
+            "generate_layered_dag": lambda: generate_layered_dag(agent_count, target_count, 4, density, rng=rng),
+            "generate_k_out_dag": lambda: generate_k_out_dag(agent_count, target_count, 3, rng=rng),
+            "default_target_generator": lambda: default_target_generator(agent_count, target_count, rng=rng),
+        }
+        for builder_name, build in builders.items():
+            results[f"builder/{builder_name}/{size}"] = time_call(
+                lambda: [build() for _ in range(SCENARIOS_PER_SIZE)], repeats
+            )
+        results[f"builder/batch_target_generator/{size}"] = time_call(
+            lambda: batch_target_generator(SCENARIOS_PER_SIZE, agent_count, target_count, rng), repeats
+        )
+
+    lp_generator = load_lp_generator()
+    for agent_count in LP_AGENT_COUNTS[sizes]:
+        graphs = lp_generator.generate_all_graphs_of_size_n(agent_count)
+        G = max(graphs, key=lambda g: g.number_of_edges())
+        print(f"Benchmarking RISB LP for {agent_count} agents...")
+        results[f"risb/compute_info_sets_all_choices/n{agent_count}"] = time_call(
+            lambda: lp_generator.compute_info_sets_all_choices(G), repeats
+        )
+        info_sets = lp_generator.compute_info_sets_all_choices(G)
+        for pruned in (False, True):
+            name = f"risb/build_and_solve_lp/{'pruned' if pruned else 'full'}/n{agent_count}"
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results[name] = time_call(lambda: lp_generator.build_and_solve_lp(G, pruned=pruned, info_sets=info_sets), 1)
+            except Exception as e:
+                print(f"Skipping {name}: {e}")
+    return results
+
+def run(args: argparse.Namespace):
+    results = run_benchmarks(args.sizes, args.repeats, args.seed)
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "networkx": nx.__version__,
+            "sizes": args.sizes,
+            "repeats": args.repeats,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {len(results)} benchmark results to [{args.output}]")
+
+def compare(args: argparse.Namespace) -> int:
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)["results"]
+
+    rows, regressions = [], 0
+    for name in sorted(set(baseline) & set(current)):
+        before, after = baseline[name]["median"], current[name]["median"]
+        ratio = after / before if before > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        elif ratio < 1 / (1 + args.threshold):
+            flag = "improved"
+        rows.append([name, f"{before * 1e3:.3f}", f"{after * 1e3:.3f}", f"{ratio:.2f}x", flag])
+
+    print(tabulate(rows, headers=["Benchmark", "Baseline (ms)", "Current (ms)", "Ratio", ""], tablefmt="simple"))
+    for name in sorted(set(baseline) ^ set(current)):
+        print(f"Only in {'baseline' if name in baseline else 'current'}: {name}")
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark suite for submodmax and the RISB LP builder.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark suite and save the results as a JSON baseline.")
+    run_parser.add_argument("--sizes", choices=sorted(SIZES), default="small")
+    run_parser.add_argument("--repeats", type=int, default=5)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", default=os.path.join("out", "benchmarks.json"))
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two JSON results and flag regressions.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%).")
+
+    imports_parser = subparsers.add_parser("imports", help="Check the import time budgets.")
+    imports_parser.add_argument("--repeats", type=int, default=5)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    elif args.command == "imports":
+        sys.exit(1 if check_imports(args.repeats)[1] else 0)
+    else:
+        sys.exit(compare(args))
@@ -1,25 +1,146 @@
+from __future__ import annotations
 import random
+import numpy as np
+from submodmax.utils.random_utils import numpy_generator
 
-def default_target_generator(agent_count: int, target_count: int) -> tuple[dict[int, list[int]], dict[int, int]]:
+def default_target_generator(
+    agent_count: int,
+    target_count: int,
+    rng: random.Random = None
+) -> tuple[dict[int, list[int]], dict[int, int]]:
     """
     Generates a set of action sets and target values to be used in a scenario.
 
     Args:
         agent_count (int): The number of agents in the scenario.
         target_count (int): The number of targets in the scenario.
+        rng (random.Random): The random number generator to be used. If None, the global `random` module is used.
     
     Returns:
         tuple: A tuple containing:
             - dict[int, list[int]]: A dictionary mapping agents to their corresponding action sets.
             - dict[int, int]: A dictionary mapping targets to their corresponding values. 
     """
+    rng = rng or random
     unreachable_targets = set(range(1, target_count + 1))
     action_sets = {}
     for agent in range(1, agent_count + 1):
-       targets = random.sample(range(1, target_count + 1), 2)
+       targets = rng.sample(range(1, target_count + 1), 2)
        action_sets[agent] = targets
        unreachable_targets.difference_update(targets)
     for target in unreachable_targets:
-        action_sets[random.randint(1, agent_count)].append(target)
-    target_values = {target: random.randint(1, 5) for target in range(1, target_count + 1)}
-    return action_sets, target_values
\ No newline at end of file
+        action_sets[rng.randint(1, agent_count)].append(target)
+    target_values = {target: rng.randint(1, 5) for target in range(1, target_count + 1)}
+    return action_sets, target_values
+
+ACTIONS_PER_AGENT = 2
+MAX_TARGET_VALUE = 5
+
+def batch_target_generator(
+    scenario_count: int,
+    agent_count: int,
+    target_count: int,
+    rng: random.Random | np.random.Generator = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Generates the action sets and target values of `scenario_count` scenarios at once, with the same distribution as
+    `default_target_generator`: every agent gets 2 distinct random targets, each target that no agent can reach is
+    added to the action set of a random agent and every target gets a random value between 1 and 5.
+
+    The result is in the padded format of `ScenarioBatch`, so `ScenarioBatch(*batch_target_generator(...))` can be
+    passed straight to the batch algorithms.
+
+    Args:
+        scenario_count (int): The number of scenarios (N).
+        agent_count (int): The number of agents in each scenario.
+        target_count (int): The number of targets in each scenario.
+        rng (random.Random | np.random.Generator): The random number generator to be used. A `random.Random` (or the
+            global `random` module, if None) seeds a `np.random.Generator`.
+    
+    Returns:
+        tuple: A tuple containing:
+            - np.ndarray: An (N, agent_count, max_action_set_size) int32 array of action sets, padded with 0.
+            - np.ndarray: An (N, target_count + 1) array of target values, where column 0 (no target) is 0.
+    """
+    if target_count < ACTIONS_PER_AGENT:
+        raise ValueError(f"Every agent needs {ACTIONS_PER_AGENT} distinct targets, but there are only {target_count}.")
+    generator = numpy_generator(rng)
+    scenarios = np.arange(scenario_count)[:, None]
+
+    # Two distinct targets per agent: the second is drawn from the other target_count - 1 targets
+    first = generator.integers(1, target_count + 1, size=(scenario_count, agent_count))
+    second = generator.integers(1, target_count, size=(scenario_count, agent_count))
+    second += second >= first
+
+    # Targets left unreachable are each given to a random agent
+    reachable = np.zeros((scenario_count, target_count + 1), dtype=bool)
+    reachable[scenarios, first] = True
+    reachable[scenarios, second] = True
+    owners = generator.integers(0, agent_count, size=(scenario_count, target_count + 1))
+    leftover_scenarios, leftover_targets = np.nonzero(~reachable[:, 1:])
+    leftover_targets += 1
+    leftover_owners = owners[leftover_scenarios, leftover_targets]
+
+    # Each leftover target goes in the next free slot of its owner's action set (in increasing order of target)
+    order = np.lexsort((leftover_targets, leftover_owners, leftover_scenarios))
+    leftover_scenarios, leftover_targets, leftover_owners = leftover_scenarios[order], leftover_targets[order], leftover_owners[order]
+    group_keys = leftover_scenarios * agent_count + leftover_owners
+    group_starts = np.flatnonzero(np.r_[True, group_keys[1:] != group_keys[:-1]]) if len(group_keys) else group_keys
+    slots = np.arange(len(group_keys)) - np.repeat(group_starts, np.diff(np.r_[group_starts, len(group_keys)]))
+
+    action_matrix = np.zeros(
+        (scenario_count, agent_count, ACTIONS_PER_AGENT + int(slots.max(initial=-1)) + 1), dtype=np.int32
+    )
+    action_matrix[:, :, 0] = first
+    action_matrix[:, :, 1] = second
+    action_matrix[leftover_scenarios, leftover_owners, ACTIONS_PER_AGENT + slots] = leftover_targets
+
+    value_matrix = generator.integers(1, MAX_TARGET_VALUE + 1, size=(scenario_count, target_count + 1))
+    value_matrix[:, 0] = 0
+    return action_matrix, value_matrix
+
+class BatchedTargetGenerator:
+    """
+    A target generator with the interface of `default_target_generator` that draws its action sets and target values
+    from `batch_target_generator`, so it can be passed as the `target_generator` of the scenario builders.
+
+    Without an `rng`, scenarios are generated `batch_size` at a time (from the generator's own seeded stream) and handed
+    out one per call. When an `rng` is given (e.g. by a seeded simulation, so that every run can be rebuilt on its
+    own), a single scenario is generated from it, which is still vectorized over the agents.
+    """
+    def __init__(self, batch_size: int = 1024, seed: int = None):
+        """
+        Args:
+            batch_size (int): The number of scenarios generated per batch.
+            seed (int): The seed of the generator's own random stream. If None, it is seeded from the global `random`
+                module.
+        """
+        self.batch_size = batch_size
+        self.generator = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+        self.batches = {}
+
+    def __call__(
+        self,
+        agent_count: int,
+        target_count: int,
+        rng: random.Random = None
+    ) -> tuple[dict[int, list[int]], dict[int, int]]:
+        if rng is not None:
+            action_matrix, value_matrix = batch_target_generator(1, agent_count, target_count, rng)
+            return _unpack_targets(action_matrix[0], value_matrix[0])
+
+        # Batches are kept per (agent count, target count) so builders of different sizes can share a generator
+        key = (agent_count, target_count)
+        action_matrix, value_matrix, position = self.batches.get(key, (None, None, self.batch_size))
+        if position == self.batch_size:
+            action_matrix, value_matrix = batch_target_generator(self.batch_size, agent_count, target_count, self.generator)
+            position = 0
+        self.batches[key] = (action_matrix, value_matrix, position + 1)
+        return _unpack_targets(action_matrix[position], value_matrix[position])
+
+def _unpack_targets(actions: np.ndarray, values: np.ndarray) -> tuple[dict[int, list[int]], dict[int, int]]:
+    # Padding only ever follows the real targets of an action set
+    sizes = np.count_nonzero(actions, axis=1).tolist()
+    action_sets = {agent: row[:size] for agent, (row, size) in enumerate(zip(actions.tolist(), sizes), start=1)}
+    target_values = dict(enumerate(values.tolist()[1:], start=1))
+    return action_sets, target_values
@@ -1,7 +1,11 @@
+import random
 from typing import Callable, Any
 from submodmax.objects.scenario import Scenario
 from submodmax.objects.assignment import Assignment
+from submodmax.objects.knowledge import AgentKnowledge
 from submodmax.utils.assignment_utils import score_assignment
+from submodmax.utils.rule_utils import supported_keyword_arguments
+from submodmax.utils.profiling import Profiler
 from submodmax.information_sharing_rules import RULE_NAMES
 
 UNKNOWN = 0
@@ -40,9 +44,14 @@ def distributed_greedy(scenario: Scenario) -> Assignment:
     eff = assignment_val / optimal_val if optimal_val != 0 else 1.0
     return Assignment(choices, assignment_val, eff, "Distributed Greedy", None)
 
+ENGINES = ("bitset", "dict")
+
 def greedy_with_information_sharing_rule(
         scenario: Scenario,
-        rule: Callable[[Any, dict[int, int], dict[int, int], int], tuple[int, int]]
+        rule: Callable[[Any, dict[int, int], dict[int, int], int], tuple[int, int]],
+        engine: str = "bitset",
+        rng: random.Random = None,
+        profiler: Profiler = None
 ) -> Assignment:
     """
     Returns an assignment of agents to targets for the provided scenario detemined by an information sharing rule paired with a
@@ -50,17 +59,40 @@ def greedy_with_information_sharing_rule(
 
     Args:
         scenario (Scenario): The scenario to be assessed.
-        rule (Callable): A function that defines the information that each agent shares with its neighbors.
+        rule (Callable): A function that defines the information that each agent shares with its neighbors. Rules that
+            accept a `metrics` keyword argument are passed the scenario's cached `GraphMetrics`.
+        engine (str): How each agent's knowledge is stored during the simulation. 'bitset' stores only the decisions each
+            agent has learned along with a bitset of known targets (see `AgentKnowledge`), while 'dict' stores a full
+            knowledge dictionary for every agent. Both produce the same assignment.
+        rng (random.Random): A random number generator passed to rules that accept an `rng` keyword argument.
+        profiler (Profiler): If provided, the calls to `rule` are timed as the phase 'rule/<rule name>'.
     
     Returns:
         Assignment: An assignment object.
     """
-    
-    G = scenario.get_graph_copy()
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Options are {ENGINES}.")
+
+    G = scenario.get_graph()
     action_sets = scenario.get_action_set()
     target_values = scenario.get_target_values()
     optimal_value = scenario.get_optimal_value()
+    rule_kwargs = supported_keyword_arguments(rule, metrics=scenario.get_graph_metrics(), rng=rng)
+    rule_call = rule if profiler is None else profiler.timed(f"rule/{RULE_NAMES[rule]}", rule)
+
+    if engine == "bitset":
+        choices = _bitset_knowledge_choices(G, action_sets, target_values, rule_call, rule_kwargs)
+    else:
+        choices = _dict_knowledge_choices(G, action_sets, target_values, rule_call, rule_kwargs)
+
+    assignment = Assignment(choices, algorithm_used="Greedy with Info Sharing")
+    score = score_assignment(assignment, target_values)
+    assignment.set_value(score)
+    assignment.set_efficiency(score / optimal_value if optimal_value != 0 else 1.0)
+    assignment.set_rule_used(RULE_NAMES[rule])
+    return assignment
 
+def _dict_knowledge_choices(G, action_sets, target_values, rule, rule_kwargs) -> dict[int, int]:
     agent_count = len(G)
     knowledge_dict = {agent: {a: UNKNOWN for a in range(1, agent_count + 1)} for agent in range(1, agent_count + 1)}
     choices = {}
@@ -76,13 +108,35 @@ def greedy_with_information_sharing_rule(
         knowledge_dict[agent][agent] = best_option
         
         # Pass information based on rule
-        agent_passed, agent_passed_choice = rule(G, knowledge_dict[agent], target_values, agent)
+        agent_passed, agent_passed_choice = rule(G, knowledge_dict[agent], target_values, agent, **rule_kwargs)
         for neighbor in G.successors(agent):
             knowledge_dict[neighbor][agent_passed] = agent_passed_choice
-    
-    assignment = Assignment(choices, algorithm_used="Greedy with Info Sharing")
-    score = score_assignment(assignment, target_values)
-    assignment.set_value(score)
-    assignment.set_efficiency(score / optimal_value if optimal_value != 0 else 1.0)
-    assignment.set_rule_used(RULE_NAMES[rule])
-    return assignment
\ No newline at end of file
+    return choices
+
+def _bitset_knowledge_choices(G, action_sets, target_values, rule, rule_kwargs) -> dict[int, int]:
+    agent_count = len(G)
+    pending_knowledge = {}
+    choices = {}
+    for agent in range(1, agent_count + 1):
+        # An agent's knowledge is only needed until it has made its decision and passed its information along
+        knowledge = pending_knowledge.pop(agent, None) or AgentKnowledge()
+
+        # Greedy selection based on limited information available to agent
+        action_set = action_sets[agent]
+        best_option = action_set[0] if action_set else None
+        bo_val = 0
+        for target_option in action_set:
+            if not knowledge.knows_target(target_option) and target_values[target_option] > bo_val:
+                best_option = target_option
+                bo_val = target_values[target_option]
+        choices[agent] = best_option
+        knowledge.learn(agent, best_option)
+
+        # Pass information based on rule (agents that have already decided cannot make use of it)
+        agent_passed, agent_passed_choice = rule(G, knowledge, target_values, agent, **rule_kwargs)
+        for neighbor in G.successors(agent):
+            if neighbor > agent:
+                if neighbor not in pending_knowledge:
+                    pending_knowledge[neighbor] = AgentKnowledge()
+                pending_knowledge[neighbor].learn(agent_passed, agent_passed_choice)
+    return choices
@@ -0,0 +1,79 @@
+from __future__ import annotations
+import numpy as np
+from collections import defaultdict
+from typing import Callable
+from submodmax.objects.scenario import Scenario
+from submodmax.objects.assignment import Assignment
+from submodmax.objects.scenario_batch import ScenarioBatch, PADDING
+from submodmax.algorithms import distributed_greedy
+
+def batch_distributed_greedy(batch: ScenarioBatch, return_choices: bool = False) -> tuple[np.ndarray, ...]:
+    """
+    Runs the distributed greedy algorithm on every scenario of the provided batch at once. Agents still make their
+    decisions sequentially, but each agent step is evaluated across all scenarios of the batch as array operations.
+    The results are identical to calling `distributed_greedy` on each scenario individually.
+
+    Args:
+        batch (ScenarioBatch): The batch of scenarios to be assessed.
+        return_choices (bool): Determines whether (True) or not (False) the choices of the agents are also returned.
+    
+    Returns:
+        tuple: A tuple containing:
+            - np.ndarray: The value of the assignment found in each scenario.
+            - np.ndarray: The efficiency of the assignment found in each scenario.
+            - np.ndarray: Only if `return_choices` is True, an (N, agent_count) array holding the target chosen by each
+              agent in each scenario (0 if the agent made no choice).
+    """
+    action_matrix = batch.get_action_matrix()
+    functional_target_values = batch.get_value_matrix().astype(float)
+    scenario_indices = np.arange(len(batch))
+    assignment_vals = np.zeros(len(batch))
+    choices = np.zeros((len(batch), batch.get_agent_count()), dtype=np.int32)
+
+    for agent in range(batch.get_agent_count()):
+        options = action_matrix[:, agent, :]
+        option_vals = np.take_along_axis(functional_target_values, options, axis=1)
+        # Padding is worth -1 (the starting best value in `distributed_greedy`) so real options always win
+        option_vals[options == PADDING] = -1
+        best = np.argmax(option_vals, axis=1)
+        assignment_vals += option_vals[scenario_indices, best]
+        choices[:, agent] = options[scenario_indices, best]
+        functional_target_values[scenario_indices, choices[:, agent]] = 0
+
+    optimal_vals = batch.get_optimal_values()
+    effs = np.divide(assignment_vals, optimal_vals, out=np.ones(len(batch)), where=optimal_vals != 0)
+    if return_choices:
+        return assignment_vals, effs, choices
+    return assignment_vals, effs
+
+def batch_distributed_greedy_from_scenarios(scenarios: list[Scenario]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Packs the provided scenarios into a `ScenarioBatch` and runs `batch_distributed_greedy` on it.
+    """
+    return batch_distributed_greedy(ScenarioBatch.from_scenarios(scenarios))
+
+def batch_distributed_greedy_assignments(scenarios: list[Scenario]) -> list[Assignment]:
+    """
+    Runs `batch_distributed_greedy` on the provided scenarios, batching together the scenarios with the same number of
+    agents, and returns the assignment `distributed_greedy` returns for each scenario (in the order given).
+
+    The optimal value of each scenario is taken from the scenario, so optima supplied by an `OptimumCache` or a
+    `ScenarioCorpus` are reused. Scenarios whose optimum is unknown are still solved one at a time.
+    """
+    groups = defaultdict(list)
+    for position, scenario in enumerate(scenarios):
+        groups[scenario.get_agent_count()].append(position)
+    assignments = [None] * len(scenarios)
+    for positions in groups.values():
+        group = [scenarios[position] for position in positions]
+        values, effs, choices = batch_distributed_greedy(ScenarioBatch.from_scenarios(group), return_choices=True)
+        for position, scenario, value, eff, agent_choices in zip(positions, group, values, effs, choices):
+            value = int(value) if scenario.values_array.dtype.kind in "iub" else float(value)
+            assignments[position] = Assignment(agent_choices, value, float(eff), "Distributed Greedy", None)
+    return assignments
+
+# Algorithms that `algorithms_versus_scenarios` evaluates over a whole chunk of scenarios at once (when they are given
+# no parameters), mapped to their batch version returning one assignment per scenario
+BATCH_ALGORITHMS: dict[Callable[..., Assignment], Callable[[list[Scenario]], list[Assignment]]] = {
+    distributed_greedy: batch_distributed_greedy_assignments,
+}
@@ -0,0 +1,182 @@
+from __future__ import annotations
+import random
+import numpy as np
+from submodmax.objects.agent_graph import AgentGraph
+from submodmax.utils.random_utils import numpy_generator
+
+# Graph generators producing the compact `AgentGraph` format directly. Edges are sampled by index arithmetic or
+# vectorized NumPy draws, so the n(n - 1) / 2 possible edges of a linearized DAG are never materialized.
+#
+# Every generator accepting an `rng` takes either a `random.Random` (or None for the global `random` module) or a
+# `np.random.Generator`. The generators draw from a `np.random.Generator`, which is seeded from a `random.Random` when
+# one is given (see `numpy_generator`).
+
+def line_graph(agent_count: int) -> AgentGraph:
+    """
+    Returns the line graph 1 -> 2 -> ... -> n.
+    """
+    sources = np.arange(1, agent_count, dtype=np.int32)
+    return AgentGraph(agent_count, np.column_stack((sources, sources + 1)))
+
+def pass_to_last_graph(agent_count: int) -> AgentGraph:
+    """
+    Returns the graph containing an edge from every agent to the final agent.
+    """
+    sources = np.arange(1, agent_count, dtype=np.int32)
+    return AgentGraph(agent_count, np.column_stack((sources, np.full_like(sources, agent_count))))
+
+def paired_graph(agent_count: int) -> AgentGraph:
+    """
+    Returns the graph containing an edge from every odd numbered agent to the following agent (if one exists).
+    """
+    sources = np.arange(1, agent_count, 2, dtype=np.int32)
+    return AgentGraph(agent_count, np.column_stack((sources, sources + 1)))
+
+def random_linearized_dag(
+    agent_count: int,
+    edge_count: int,
+    rng: random.Random | np.random.Generator = None,
+    legacy_sampling: bool = False
+) -> AgentGraph:
+    """
+    Returns a linearized DAG (every edge goes from an agent to a later agent) with exactly `edge_count` edges chosen
+    uniformly at random. The edges are drawn as indices into the lexicographic order of the n(n - 1) / 2 possible
+    edges and decoded arithmetically.
+
+    Args:
+        agent_count (int): The number of agents.
+        edge_count (int): The number of edges. Must be at most n(n - 1) / 2.
+        rng (random.Random | np.random.Generator): The random number generator to be used. If None, the global
+            `random` module is used.
+        legacy_sampling (bool): Determines whether (True) or not (False) the edges are drawn from a `random.Random`
+            with `random.sample`, which draws the same numbers as the original sampling of the list of possible edges
+            and so reproduces the graphs seeded before the vectorized sampler was introduced. It is much slower for
+            large graphs, and ignored if `rng` is a `np.random.Generator`.
+
+    Returns:
+        AgentGraph: The generated graph.
+    """
+    possible_edge_count = agent_count * (agent_count - 1) // 2
+    if not 0 <= edge_count <= possible_edge_count:
+        raise ValueError(f"Cannot choose {edge_count} edges for a DAG on {agent_count} agents.")
+    if legacy_sampling and not isinstance(rng, np.random.Generator):
+        # Sampling the indices draws the same random numbers as sampling the list of possible edges
+        indices = np.asarray((rng or random).sample(range(possible_edge_count), edge_count), dtype=np.int64)
+    else:
+        indices = np.sort(numpy_generator(rng).choice(possible_edge_count, size=edge_count, replace=False))
+    sources, destinations = _decode_pair_indices(indices, agent_count)
+    return AgentGraph(agent_count, _group_by_source(sources, destinations))
+
+def random_dag_by_probability(
+    agent_count: int,
+    edge_probability: float,
+    rng: random.Random | np.random.Generator = None
+) -> AgentGraph:
+    """
+    Returns a linearized DAG in which each of the n(n - 1) / 2 possible edges is present independently with probability
+    `edge_probability`. The number of edges is drawn from the corresponding binomial distribution and that many
+    distinct edges are chosen uniformly at random, which gives the same distribution.
+
+    Args:
+        agent_count (int): The number of agents.
+        edge_probability (float): The probability that each possible edge is present.
+        rng (random.Random | np.random.Generator): The random number generator to be used. If None, the global
+            `random` module is used.
+
+    Returns:
+        AgentGraph: The generated graph.
+    """
+    generator = numpy_generator(rng)
+    possible_edge_count = agent_count * (agent_count - 1) // 2
+    edge_count = int(generator.binomial(possible_edge_count, edge_probability)) if possible_edge_count else 0
+    return random_linearized_dag(agent_count, edge_count, generator)
+
+def layered_dag(
+    agent_count: int,
+    layer_count: int,
+    edge_probability: float,
+    rng: random.Random | np.random.Generator = None
+) -> AgentGraph:
+    """
+    Returns a layered DAG. The agents are split into `layer_count` consecutive layers of (nearly) equal size and each
+    possible edge from an agent to an agent of the next layer is present independently with probability
+    `edge_probability`.
+
+    Args:
+        agent_count (int): The number of agents.
+        layer_count (int): The number of layers.
+        edge_probability (float): The probability that each possible edge between consecutive layers is present.
+        rng (random.Random | np.random.Generator): The random number generator to be used. If None, the global
+            `random` module is used.
+
+    Returns:
+        AgentGraph: The generated graph.
+    """
+    if layer_count < 1:
+        raise ValueError("A layered DAG needs at least one layer.")
+    generator = numpy_generator(rng)
+    layer_sizes = [len(layer) for layer in np.array_split(np.arange(agent_count), layer_count)]
+    layer_starts = np.concatenate(([1], 1 + np.cumsum(layer_sizes))).tolist()
+    edges = []
+    for layer in range(layer_count - 1):
+        size, next_size = layer_sizes[layer], layer_sizes[layer + 1]
+        edge_count = int(generator.binomial(size * next_size, edge_probability)) if size * next_size else 0
+        indices = np.sort(generator.choice(size * next_size, size=edge_count, replace=False))
+        edges.append(np.column_stack((layer_starts[layer] + indices // next_size, layer_starts[layer + 1] + indices % next_size)))
+    return AgentGraph(agent_count, np.concatenate(edges) if edges else np.empty((0, 2), dtype=np.int32))
+
+def k_out_dag(
+    agent_count: int,
+    k: int,
+    rng: random.Random | np.random.Generator = None
+) -> AgentGraph:
+    """
+    Returns a linearized DAG in which every agent has an edge to `k` distinct later agents chosen uniformly at random
+    (or to every later agent, if there are fewer than `k`). The successors of all agents are drawn at once with a
+    vectorized version of Floyd's sampling algorithm.
+
+    Args:
+        agent_count (int): The number of agents.
+        k (int): The number of successors of each agent.
+        rng (random.Random | np.random.Generator): The random number generator to be used. If None, the global
+            `random` module is used.
+
+    Returns:
+        AgentGraph: The generated graph.
+    """
+    generator = numpy_generator(rng)
+    later_counts = np.arange(agent_count - 1, -1, -1, dtype=np.int64)
+    out_degrees = np.minimum(k, later_counts)
+    offsets = np.full((agent_count, max(k, 0)), -1, dtype=np.int64)
+    for column in range(max(k, 0)):
+        # Floyd: draw from [0, j] and take j itself if the draw was already chosen
+        active = column < out_degrees
+        j = later_counts - out_degrees + column
+        draws = generator.integers(0, np.maximum(j, 0) + 1)
+        repeated = (offsets[:, :column] == draws[:, None]).any(axis=1)
+        offsets[:, column] = np.where(active, np.where(repeated, j, draws), -1)
+    agents, columns = np.nonzero(offsets >= 0)
+    return AgentGraph(agent_count, np.column_stack((agents + 1, agents + 2 + offsets[agents, columns])))
+
+def _decode_pair_indices(indices: np.ndarray, agent_count: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decodes indices into the lexicographic order of the pairs (u, v) with 1 <= u < v <= n into the sources u and
+    destinations v.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    # Row r (0-indexed, source r + 1) starts at offset r(n - 1) - r(r - 1) / 2, so r is the largest root of the
+    # quadratic with offset(r) <= index. The floating point estimate is corrected by one step in either direction.
+    b = 2 * agent_count - 1
+    rows = np.floor((b - np.sqrt(np.maximum(b * b - 8.0 * indices, 0.0))) / 2).astype(np.int64)
+    offset = lambda r: r * (agent_count - 1) - r * (r - 1) // 2
+    rows -= offset(rows) > indices
+    rows += offset(rows + 1) <= indices
+    sources = rows + 1
+    destinations = sources + 1 + (indices - offset(rows))
+    return sources, destinations
+
+def _group_by_source(sources: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+    # Edges are grouped by source (keeping the order in which they were drawn), which is the order an `nx.DiGraph`
+    # with nodes 1, ..., n reports them in
+    order = np.argsort(sources, kind="stable")
+    return np.column_stack((sources[order], destinations[order])).astype(np.int32)
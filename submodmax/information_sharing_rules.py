@@ -1,9 +1,16 @@
-import networkx as nx
+from __future__ import annotations
 import random
+from typing import TYPE_CHECKING
+from submodmax.objects.agent_graph import AgentGraph
+from submodmax.objects.graph_metrics import GraphMetrics
+
+if TYPE_CHECKING:
+    import networkx as nx
+
 UNKNOWN = 0
 
 def generalized_distributed_greedy_rule(
-    G: nx.DiGraph, 
+    G: nx.DiGraph | AgentGraph, 
     knowledge: dict[int, int], 
     target_values: dict[int, int], 
     current_agent: int
@@ -13,7 +20,7 @@ def generalized_distributed_greedy_rule(
     in the generalized distributed greedy algorithm.
 
     Args:
-        G (nx.Digraph): The directed graph representing which agents share information with which other agents.
+        G (nx.DiGraph | AgentGraph): The directed graph representing which agents share information with which other agents.
         knowledge (dict[int, int]): A dictionary representing the current agent's knowledge of the decisions made
             by other agents. Each key denotes an agent and its corresponding value is the current agent's knowledge of
             that agent's choice of target. A value of 0 (UNKNOWN) indicates that the current agent has no knowledge of that
@@ -28,7 +35,7 @@ def generalized_distributed_greedy_rule(
     return current_agent, knowledge[current_agent]
 
 def highest_marginal_contribution_rule(
-    G: nx.DiGraph, 
+    G: nx.DiGraph | AgentGraph, 
     knowledge: dict[int, int], 
     target_values: dict[int, int], 
     current_agent: int
@@ -38,7 +45,7 @@ def highest_marginal_contribution_rule(
     the overall score of an assignment, restricted to the knowledge of the current agent.
 
     Args:
-        G (nx.Digraph): The directed graph representing which agents share information with which other agents.
+        G (nx.DiGraph | AgentGraph): The directed graph representing which agents share information with which other agents.
         knowledge (dict[int, int]): A dictionary representing the current agent's knowledge of the decisions made
             by other agents. Each key denotes an agent and its corresponding value is the current agent's knowledge of
             that agent's choice of target. A value of 0 (UNKNOWN) indicates that the current agent has no knowledge of that
@@ -62,7 +69,7 @@ def highest_marginal_contribution_rule(
 
 
 def most_upstream_agent_rule(
-    G: nx.DiGraph, 
+    G: nx.DiGraph | AgentGraph, 
     knowledge: dict[int, int], 
     target_values: dict[int, int], 
     current_agent: int
@@ -73,7 +80,7 @@ def most_upstream_agent_rule(
     ties, the pair with the highest target value is chosen.
 
     Args:
-        G (nx.Digraph): The directed graph representing which agents share information with which other agents.
+        G (nx.DiGraph | AgentGraph): The directed graph representing which agents share information with which other agents.
         knowledge (dict[int, int]): A dictionary representing the current agent's knowledge of the decisions made
             by other agents. Each key denotes an agent and its corresponding value is the current agent's knowledge of
             that agent's choice of target. A value of 0 (UNKNOWN) indicates that the current agent has no knowledge of that
@@ -98,23 +105,26 @@ def most_upstream_agent_rule(
     return upstream_agent, best_choice
 
 def least_likely_known_amongst_neighborhood_rule(
-    G: nx.DiGraph, 
+    G: nx.DiGraph | AgentGraph, 
     knowledge: dict[int, int], 
     target_values: dict[int, int], 
-    current_agent: int
+    current_agent: int,
+    metrics: GraphMetrics = None
 ) -> tuple[int, int]:
     """
     An information sharing rule that returns the (agent, choice of target) pair that the current agent's neighbors are least 
     likely to know about. If there are ties, the pair with the highest target value is chosen.
 
     Args:
-        G (nx.Digraph): The directed graph representing which agents share information with which other agents.
+        G (nx.DiGraph | AgentGraph): The directed graph representing which agents share information with which other agents.
         knowledge (dict[int, int]): A dictionary representing the current agent's knowledge of the decisions made
             by other agents. Each key denotes an agent and its corresponding value is the current agent's knowledge of
             that agent's choice of target. A value of 0 (UNKNOWN) indicates that the current agent has no knowledge of that
             agent's choice of target.
         target_values (dict[int, int]): A dictionary mapping targets to their corresponding values.
         current_agent (int): The current agent being assessed.
+        metrics (GraphMetrics): The cached metrics of G, from which the predecessor sets are read. If None,
+            they are computed from G.
     
     Returns:
         tuple[int, int]: a pair where the first element is the agent to be shared and the second element 
@@ -124,6 +134,7 @@ def least_likely_known_amongst_neighborhood_rule(
     if not known_agents:
         return current_agent, knowledge[current_agent]
 
+    predecessor_sets = (metrics or GraphMetrics(G)).get_predecessor_sets()
     max_novelty = -1
     best_agent = current_agent
     best_choice = knowledge[current_agent]
@@ -133,7 +144,7 @@ def least_likely_known_amongst_neighborhood_rule(
         novelty = 0
         for neighbor in G.successors(current_agent):
             # If 'a' is not an in-neighbor of 'neighbor', then neighbor is unlikely to know about 'a'
-            if a not in G.predecessors(neighbor):
+            if a not in predecessor_sets[neighbor]:
                 novelty += 1
         # Prefer higher target value in case of tie
         if novelty > max_novelty or (novelty == max_novelty and knowledge[a] and target_values[knowledge[a]] > best_value):
@@ -144,10 +155,11 @@ def least_likely_known_amongst_neighborhood_rule(
     return best_agent, best_choice
 
 def random_known_agent_rule(
-    G: nx.DiGraph, 
+    G: nx.DiGraph | AgentGraph, 
     knowledge: dict[int, int], 
     target_values: dict[int, int], 
-    current_agent: int
+    current_agent: int,
+    rng: random.Random = None
 ) -> tuple[int, int]:
     """
     An information sharing rule that randomly selects an agent whose decision is known to the current agent and returns the
@@ -155,13 +167,14 @@ def random_known_agent_rule(
     own decision is returned.
 
     Args:
-        G (nx.Digraph): The directed graph representing which agents share information with which other agents.
+        G (nx.DiGraph | AgentGraph): The directed graph representing which agents share information with which other agents.
         knowledge (dict[int, int]): A dictionary representing the current agent's knowledge of the decisions made
             by other agents. Each key denotes an agent and its corresponding value is the current agent's knowledge of
             that agent's choice of target. A value of 0 (UNKNOWN) indicates that the current agent has no knowledge of that
             agent's choice of target.
         target_values (dict[int, int]): A dictionary mapping targets to their corresponding values.
         current_agent (int): The current agent being assessed.
+        rng (random.Random): The random number generator to be used. If None, the global `random` module is used.
     
     Returns:
         tuple[int, int]: a pair where the first element is the agent to be shared and the second element 
@@ -170,34 +183,37 @@ def random_known_agent_rule(
     known_agents = [a for a, t in knowledge.items() if t != UNKNOWN]
     if not known_agents:
         return current_agent, knowledge[current_agent]
-    chosen_agent = random.choice(known_agents)
+    chosen_agent = (rng or random).choice(known_agents)
     return chosen_agent, knowledge[chosen_agent]
 
 def degree_centrality_rule(
-    G: nx.DiGraph, 
+    G: nx.DiGraph | AgentGraph, 
     knowledge: dict[int, int], 
     target_values: dict[int, int], 
-    current_agent: int
+    current_agent: int,
+    metrics: GraphMetrics = None
 ) -> tuple[int, int]:
     """
     An information sharing rule that returns the (agent, choice of target) pair corresponding to the known agent with the 
     highest degree centrality. If there are ties, the pair with the highest target value is chosen.
 
     Args:
-        G (nx.Digraph): The directed graph representing which agents share information with which other agents.
+        G (nx.DiGraph | AgentGraph): The directed graph representing which agents share information with which other agents.
         knowledge (dict[int, int]): A dictionary representing the current agent's knowledge of the decisions made
             by other agents. Each key denotes an agent and its corresponding value is the current agent's knowledge of
             that agent's choice of target. A value of 0 (UNKNOWN) indicates that the current agent has no knowledge of that
             agent's choice of target.
         target_values (dict[int, int]): A dictionary mapping targets to their corresponding values.
         current_agent (int): The current agent being assessed.
+        metrics (GraphMetrics): The cached metrics of G, holding its degree centrality. If None, the centrality is
+            computed from G.
     
     Returns:
         tuple[int, int]: a pair where the first element is the agent to be shared and the second element 
             is that agent's choice of target.
     """
-    # Compute centrality for all nodes
-    centrality = nx.degree_centrality(G)
+    # Centrality for all nodes is computed once per graph
+    centrality = (metrics or GraphMetrics(G)).get_degree_centrality()
     known_agents = [a for a, t in knowledge.items() if t != UNKNOWN]
     if not known_agents:
         return current_agent, knowledge[current_agent]
@@ -220,30 +236,33 @@ def degree_centrality_rule(
     return best_agent, best_choice
 
 def betweenness_centrality_rule(
-    G: nx.DiGraph, 
+    G: nx.DiGraph | AgentGraph, 
     knowledge: dict[int, int], 
     target_values: dict[int, int], 
-    current_agent: int
+    current_agent: int,
+    metrics: GraphMetrics = None
 ) -> tuple[int, int]:
     """
     An information sharing rule that returns the (agent, choice of target) pair corresponding to the known agent with the 
     highest betweeness centrality. If there are ties, the pair with the highest target value is chosen.
 
     Args:
-        G (nx.Digraph): The directed graph representing which agents share information with which other agents.
+        G (nx.DiGraph | AgentGraph): The directed graph representing which agents share information with which other agents.
         knowledge (dict[int, int]): A dictionary representing the current agent's knowledge of the decisions made
             by other agents. Each key denotes an agent and its corresponding value is the current agent's knowledge of
             that agent's choice of target. A value of 0 (UNKNOWN) indicates that the current agent has no knowledge of that
             agent's choice of target.
         target_values (dict[int, int]): A dictionary mapping targets to their corresponding values.
         current_agent (int): The current agent being assessed.
+        metrics (GraphMetrics): The cached metrics of G, holding its betweenness centrality. If None, the
+            centrality is computed from G.
     
     Returns:
         tuple[int, int]: a pair where the first element is the agent to be shared and the second element 
             is that agent's choice of target.
     """
-    # Compute centrality for all nodes
-    centrality = nx.betweenness_centrality(G)
+    # Centrality for all nodes is computed once per graph
+    centrality = (metrics or GraphMetrics(G)).get_betweenness_centrality()
     known_agents = [a for a, t in knowledge.items() if t != UNKNOWN]
     if not known_agents:
         return current_agent, knowledge[current_agent]
@@ -266,30 +285,33 @@ def betweenness_centrality_rule(
     return best_agent, best_choice
 
 def closeness_centrality_rule(
-    G: nx.DiGraph, 
+    G: nx.DiGraph | AgentGraph, 
     knowledge: dict[int, int], 
     target_values: dict[int, int], 
-    current_agent: int
+    current_agent: int,
+    metrics: GraphMetrics = None
 ) -> tuple[int, int]:
     """
     An information sharing rule that returns the (agent, choice of target) pair corresponding to the known agent with the 
     highest closeness centrality. If there are ties, the pair with the highest target value is chosen.
 
     Args:
-        G (nx.Digraph): The directed graph representing which agents share information with which other agents.
+        G (nx.DiGraph | AgentGraph): The directed graph representing which agents share information with which other agents.
         knowledge (dict[int, int]): A dictionary representing the current agent's knowledge of the decisions made
             by other agents. Each key denotes an agent and its corresponding value is the current agent's knowledge of
             that agent's choice of target. A value of 0 (UNKNOWN) indicates that the current agent has no knowledge of that
             agent's choice of target.
         target_values (dict[int, int]): A dictionary mapping targets to their corresponding values.
         current_agent (int): The current agent being assessed.
+        metrics (GraphMetrics): The cached metrics of G, holding its closeness centrality. If None, the centrality
+            is computed from G.
     
     Returns:
         tuple[int, int]: a pair where the first element is the agent to be shared and the second element 
             is that agent's choice of target.
     """
-    # Compute centrality for all nodes
-    centrality = nx.closeness_centrality(G)
+    # Centrality for all nodes is computed once per graph
+    centrality = (metrics or GraphMetrics(G)).get_closeness_centrality()
     known_agents = [a for a, t in knowledge.items() if t != UNKNOWN]
     if not known_agents:
         return current_agent, knowledge[current_agent]
@@ -312,23 +334,26 @@ def closeness_centrality_rule(
     return best_agent, best_choice
 
 def maximize_downstream_reach(
-    G: nx.DiGraph,
+    G: nx.DiGraph | AgentGraph,
     knowledge: dict[int, int],
     target_values: dict[int, int],
-    current_agent: int
+    current_agent: int,
+    metrics: GraphMetrics = None
 ) -> tuple[int, int]:
     """
     An information sharing rule that returns the (agent, choice of target) pair amongst the current agent's knowledge that maximizes the downstream 
     reach of the source agent.
 
     Args:
-        G (nx.Digraph): The directed graph representing which agents share information with which other agents.
+        G (nx.DiGraph | AgentGraph): The directed graph representing which agents share information with which other agents.
         knowledge (dict[int, int]): A dictionary representing the current agent's knowledge of the decisions made
             by other agents. Each key denotes an agent and its corresponding value is the current agent's knowledge of
             that agent's choice of target. A value of 0 (UNKNOWN) indicates that the current agent has no knowledge of that
             agent's choice of target.
         target_values (dict[int, int]): A dictionary mapping targets to their corresponding values.
         current_agent (int): The current agent being assessed.
+        metrics (GraphMetrics): The cached metrics of G, holding the number of descendants of each agent. If
+            None, the counts are computed from G.
     
     Returns:
         tuple[int, int]: a pair where the first element is the agent to be shared and the second element 
@@ -344,9 +369,10 @@ def maximize_downstream_reach(
     # Select the (agent, target) pair whose source agent has max downstream reach
     best_decision = None
     max_reach = -1
+    descendant_counts = (metrics or GraphMetrics(G)).get_descendant_counts()
 
     for agent, target in known_decisions:
-        reach = len(nx.descendants(G, agent))
+        reach = descendant_counts[agent]
         if reach > max_reach:
             max_reach = reach
             best_decision = (agent, target)
@@ -354,23 +380,26 @@ def maximize_downstream_reach(
     return best_decision if best_decision else (-1, -1)
 
 def reach_and_value_rule(
-    info_graph: nx.DiGraph,
+    info_graph: nx.DiGraph | AgentGraph,
     knowledge: dict[int, int],
     target_values: dict[int, int],
-    current_agent: int
+    current_agent: int,
+    metrics: GraphMetrics = None
 ) -> tuple[int, int]:
     """
     An information sharing rule that returns the (agent, choice of target) pair that maximizes the product of the agent's reach and
     value of the corresponding choice of target (within the knowledge of the current agent).
 
     Args:
-        G (nx.Digraph): The directed graph representing which agents share information with which other agents.
+        G (nx.DiGraph | AgentGraph): The directed graph representing which agents share information with which other agents.
         knowledge (dict[int, int]): A dictionary representing the current agent's knowledge of the decisions made
             by other agents. Each key denotes an agent and its corresponding value is the current agent's knowledge of
             that agent's choice of target. A value of 0 (UNKNOWN) indicates that the current agent has no knowledge of that
             agent's choice of target.
         target_values (dict[int, int]): A dictionary mapping targets to their corresponding values.
         current_agent (int): The current agent being assessed.
+        metrics (GraphMetrics): The cached descendant counts of the information graph. If None, they are computed
+            from the graph.
     
     Returns:
         tuple[int, int]: a pair where the first element is the agent to be shared and the second element 
@@ -384,10 +413,11 @@ def reach_and_value_rule(
 
     best_score = -1
     best_decision = (-1, -1)
+    descendant_counts = (metrics or GraphMetrics(info_graph)).get_descendant_counts()
 
     for agent, target in known_decisions:
         value = target_values.get(target, 0)
-        reach = len(nx.descendants(info_graph, agent))  # How many agents that agent can reach
+        reach = descendant_counts[agent]  # How many agents that agent can reach
         score = value * reach
 
         if score > best_score:
@@ -397,10 +427,11 @@ def reach_and_value_rule(
     return best_decision if best_decision != (-1, -1) else known_decisions[0]
 
 def adaptive_sharing_rule(
-    G: nx.DiGraph,
+    G: nx.DiGraph | AgentGraph,
     knowledge: dict[int, int],
     target_values: dict[int, int],
-    current_agent: int
+    current_agent: int,
+    metrics: GraphMetrics = None
 ) -> tuple[int, int]:
     num_known = sum(1 for t in knowledge.values() if t != 0)
     num_agents = G.number_of_nodes()
@@ -408,10 +439,10 @@ def adaptive_sharing_rule(
 
     if progress < 0.3:
         # Early: propagate high-value or high-centrality agents
-        return degree_centrality_rule(G, knowledge, target_values, current_agent)
+        return degree_centrality_rule(G, knowledge, target_values, current_agent, metrics)
     elif progress < 0.7:
         # Mid: strategic spreading to maximize novelty or reach
-        return least_likely_known_amongst_neighborhood_rule(G, knowledge, target_values, current_agent)
+        return least_likely_known_amongst_neighborhood_rule(G, knowledge, target_values, current_agent, metrics)
     else:
         # Late: fallback to marginal contribution or greedy coverage
         return highest_marginal_contribution_rule(G, knowledge, target_values, current_agent)
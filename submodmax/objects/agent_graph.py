@@ -0,0 +1,176 @@
+from __future__ import annotations
+import numpy as np
+from collections import deque
+from typing import Iterator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+class AgentGraph:
+    """
+    An immutable directed graph over the agents 1, ..., n, used in place of an `nx.DiGraph` on the simulation hot path.
+
+    - `successor_indptr` / `successor_indices` hold the successors of each agent in CSR form (int32). The successors
+      of agent `a` are `successor_indices[successor_indptr[a - 1]:successor_indptr[a]]`, in the order their edges
+      were given. `predecessor_indptr` / `predecessor_indices` hold the predecessors in the same way.
+    - `edge_array` is an (E, 2) int32 array holding the edges in the order they were given.
+    - The topological order and the transitive closure (an integer bitset per agent, where bit `b` of agent `a` is set
+      if `b` can be reached from `a`) are computed on first use and cached.
+
+    It supports the subset of the `nx.DiGraph` interface used by the information sharing rules (`successors`,
+    `predecessors`, `nodes`, `edges`, `number_of_nodes`, `len`, ...). `to_networkx` builds an equivalent `nx.DiGraph`
+    when one is needed (e.g. for visualization or centrality measures).
+    """
+    def __init__(self, agent_count: int, edges: np.ndarray):
+        """
+        Args:
+            agent_count (int): The number of agents (n).
+            edges (np.ndarray): An (E, 2) array of (source, destination) pairs of agents. Repeated edges are ignored.
+        """
+        edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        if edges.size and (edges.min() < 1 or edges.max() > agent_count):
+            raise ValueError("Edges must be between the agents 1, ..., n.")
+        if len(edges) > 1:
+            # Drop repeated edges, keeping the first occurrence of each (as `nx.DiGraph` does)
+            keys = edges[:, 0].astype(np.int64) * (agent_count + 1) + edges[:, 1]
+            if not np.all(keys[1:] > keys[:-1]):
+                _, first = np.unique(keys, return_index=True)
+                if len(first) < len(edges):
+                    edges = edges[np.sort(first)]
+
+        self.agent_count = agent_count
+        self.edge_array = edges
+        self.successor_indptr, self.successor_indices = _csr(agent_count, edges[:, 0], edges[:, 1])
+        self.predecessor_indptr, self.predecessor_indices = _csr(agent_count, edges[:, 1], edges[:, 0])
+        self._successors = None
+        self._predecessors = None
+        self._topological_order = None
+        self._closure = None
+
+    @classmethod
+    def from_networkx(cls, G: nx.DiGraph, agent_count: int = None) -> 'AgentGraph':
+        """
+        Creates an `AgentGraph` from the edges of `G`. If `agent_count` is None, the largest agent in `G` is used.
+        """
+        if agent_count is None:
+            agent_count = max(G.nodes(), default=0)
+        return cls(agent_count, np.array(list(G.edges()), dtype=np.int32).reshape(-1, 2))
+
+    def __getstate__(self) -> dict:
+        # The adjacency tuples, topological order and closure are rebuilt from the CSR arrays when needed
+        state = self.__dict__.copy()
+        state.update(_successors=None, _predecessors=None, _topological_order=None, _closure=None)
+        return state
+
+    def __len__(self) -> int: return self.agent_count
+    def __iter__(self) -> Iterator[int]: return iter(range(1, self.agent_count + 1))
+    def __contains__(self, agent: int) -> bool: return isinstance(agent, (int, np.integer)) and 1 <= agent <= self.agent_count
+
+    def number_of_nodes(self) -> int: return self.agent_count
+    def number_of_edges(self) -> int: return len(self.edge_array)
+    def nodes(self) -> range: return range(1, self.agent_count + 1)
+    def edges(self) -> list[tuple[int, int]]: return [tuple(edge) for edge in self.edge_array.tolist()]
+    def get_agent_count(self) -> int: return self.agent_count
+    def get_edges(self) -> np.ndarray: return self.edge_array
+
+    def successors(self, agent: int) -> tuple[int, ...]:
+        """
+        Returns the agents with an edge from `agent`.
+        """
+        if self._successors is None:
+            self._successors = _adjacency_tuples(self.successor_indptr, self.successor_indices)
+        return self._successors[agent]
+
+    def predecessors(self, agent: int) -> tuple[int, ...]:
+        """
+        Returns the agents with an edge into `agent`.
+        """
+        if self._predecessors is None:
+            self._predecessors = _adjacency_tuples(self.predecessor_indptr, self.predecessor_indices)
+        return self._predecessors[agent]
+
+    def has_edge(self, source: int, destination: int) -> bool:
+        return source in self and destination in self.successors(source)
+
+    def out_degree(self, agent: int) -> int:
+        return int(self.successor_indptr[agent] - self.successor_indptr[agent - 1])
+
+    def in_degree(self, agent: int) -> int:
+        return int(self.predecessor_indptr[agent] - self.predecessor_indptr[agent - 1])
+
+    def get_topological_order(self) -> list[int]:
+        """
+        Returns the agents in a topological order, or None if the graph has a cycle.
+        """
+        if self._topological_order is None:
+            in_degrees = np.diff(self.predecessor_indptr).tolist()
+            queue = deque(agent for agent in range(1, self.agent_count + 1) if in_degrees[agent - 1] == 0)
+            order = []
+            while queue:
+                agent = queue.popleft()
+                order.append(agent)
+                for successor in self.successors(agent):
+                    in_degrees[successor - 1] -= 1
+                    if in_degrees[successor - 1] == 0:
+                        queue.append(successor)
+            self._topological_order = order if len(order) == self.agent_count else False
+        return self._topological_order if self._topological_order is not False else None
+
+    def is_directed_acyclic(self) -> bool: return self.get_topological_order() is not None
+
+    def get_closure(self) -> list[int]:
+        """
+        Returns the transitive closure of the graph as a list of integer bitsets indexed by agent (index 0 is unused),
+        where bit `b` of entry `a` is set if agent `b` can be reached from agent `a` by a path of one or more edges.
+        As with `nx.descendants`, an agent is never included in its own closure.
+        """
+        if self._closure is None:
+            closure = [0] * (self.agent_count + 1)
+            order = self.get_topological_order()
+            if order is not None:
+                # Build each agent's closure from those of its successors in reverse topological order
+                for agent in reversed(order):
+                    bits = 0
+                    for successor in self.successors(agent):
+                        bits |= (1 << successor) | closure[successor]
+                    closure[agent] = bits
+            else:
+                for agent in range(1, self.agent_count + 1):
+                    bits, stack = 0, [agent]
+                    while stack:
+                        for successor in self.successors(stack.pop()):
+                            if not bits >> successor & 1:
+                                bits |= 1 << successor
+                                stack.append(successor)
+                    closure[agent] = bits & ~(1 << agent)
+            self._closure = closure
+        return self._closure
+
+    def is_reachable(self, source: int, target: int) -> bool:
+        """
+        Returns whether `target` can be reached from `source` through the graph.
+        """
+        return bool(self.get_closure()[source] >> target & 1)
+
+    def to_networkx(self) -> nx.DiGraph:
+        """
+        Returns a new `nx.DiGraph` containing the agents 1, ..., n and the edges of the graph (in the order given).
+        """
+        import networkx as nx
+
+        G = nx.DiGraph()
+        G.add_nodes_from(range(1, self.agent_count + 1))
+        G.add_edges_from(self.edge_array.tolist())
+        return G
+
+def _csr(agent_count: int, sources: np.ndarray, destinations: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # A stable sort keeps the destinations of each source in the order their edges were given
+    order = np.argsort(sources, kind="stable")
+    indptr = np.zeros(agent_count + 1, dtype=np.int32)
+    indptr[1:] = np.cumsum(np.bincount(sources, minlength=agent_count + 1)[1:])
+    return indptr, destinations[order].astype(np.int32)
+
+def _adjacency_tuples(indptr: np.ndarray, indices: np.ndarray) -> list[tuple[int, ...]]:
+    bounds = indptr.tolist()
+    values = indices.tolist()
+    return [()] + [tuple(values[bounds[i]:bounds[i + 1]]) for i in range(len(bounds) - 1)]
@@ -1,37 +1,60 @@
+from __future__ import annotations
+import numpy as np
+
+NO_CHOICE = 0
+
 class Assignment:
+    """
+    An assignment of agents to targets. Choices are stored in an int array where entry `a - 1` holds the target chosen
+    by agent `a` (0 if the agent made no choice).
+    """
+    __slots__ = ("choice_array", "value", "efficiency", "algorithm_used", "rule_used")
+
     def __init__(
-            self, 
-            assignment: dict[int, int], 
-            value: float = None, 
+            self,
+            assignment: dict[int, int] | np.ndarray,
+            value: float = None,
             efficiency: float = None,
             algorithm_used: str = None,
             rule_used: str = None
     ):
-        self.assignment = assignment
+        if isinstance(assignment, np.ndarray):
+            self.choice_array = assignment.astype(np.int32, copy=False)
+        else:
+            if list(assignment.keys()) != list(range(1, len(assignment) + 1)):
+                raise ValueError("Assignments must map the agents 1, ..., n (in order) to their chosen targets.")
+            self.choice_array = np.fromiter(
+                (choice if choice else NO_CHOICE for choice in assignment.values()), dtype=np.int32, count=len(assignment)
+            )
         self.value = value
         self.efficiency = efficiency
         self.algorithm_used = algorithm_used
         self.rule_used = rule_used
-    
+
+    @property
+    def assignment(self) -> dict[int, int]:
+        return dict(self.get_assignment_pairs())
+
     def set_value(self, value: float):
         self.value = value
-    
+
     def set_efficiency(self, efficiency: float):
         self.efficiency = efficiency
-    
+
     def set_algorithm_used(self, algorithm_title: str):
         self.algorithm_used = algorithm_title
-    
+
     def set_rule_used(self, rule_title: str):
         self.rule_used = rule_title
-    
+
     def get_value(self) -> float: return self.value
     def get_efficiency(self) -> float: return self.efficiency
     def get_algorithm_used(self) -> str: return self.algorithm_used
     def get_rule_used(self) -> str: return self.rule_used
-    
-    def get_assignment_pairs(self) -> list[tuple[int, int]]: return self.assignment.items()
-    def get_choices(self) -> list[int]: return list(self.assignment.values())
+    def get_choice_array(self) -> np.ndarray: return self.choice_array
+
+    def get_assignment_pairs(self) -> list[tuple[int, int]]: return list(zip(range(1, len(self.choice_array) + 1), self.get_choices()))
+    def get_choices(self) -> list[int]: return [choice if choice else None for choice in self.choice_array.tolist()]
 
     def __lt__(self, other: 'Assignment'):
         return self.get_value() < other.get_value()
\ No newline at end of file
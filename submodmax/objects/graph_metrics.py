@@ -0,0 +1,114 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from submodmax.objects.agent_graph import AgentGraph
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+class GraphMetrics:
+    """
+    A cache of the metrics of an information sharing graph that are used by the information sharing rules. Each metric
+    is computed the first time it is requested and reused afterwards, so a single `GraphMetrics` object can be shared
+    by every rule call made on a scenario.
+
+    With an `AgentGraph`, the predecessor and reachable sets come from its CSR arrays and transitive closure, and an
+    `nx.DiGraph` is only built for the centrality measures (networkx is imported the first time one is needed).
+    """
+    def __init__(self, G: nx.DiGraph | AgentGraph):
+        self.G = G
+        self._networkx_graph = None if isinstance(G, AgentGraph) else G
+        self._degree_centrality = None
+        self._betweenness_centrality = None
+        self._closeness_centrality = None
+        self._predecessor_sets = None
+        self._reachable_sets = None
+        self._descendant_counts = None
+
+    def get_graph(self) -> nx.DiGraph | AgentGraph: return self.G
+
+    def get_networkx_graph(self) -> nx.DiGraph:
+        """
+        Returns the graph as an `nx.DiGraph`, converting (and caching) an `AgentGraph` on the first call.
+        """
+        if self._networkx_graph is None:
+            self._networkx_graph = self.G.to_networkx()
+        return self._networkx_graph
+
+    def get_degree_centrality(self) -> dict[int, float]:
+        if self._degree_centrality is None:
+            if isinstance(self.G, AgentGraph) and len(self.G) > 1:
+                # The same computation as `nx.degree_centrality`, using the degrees stored in the CSR arrays
+                degrees = (self.G.successor_indptr[1:] - self.G.successor_indptr[:-1]) + \
+                    (self.G.predecessor_indptr[1:] - self.G.predecessor_indptr[:-1])
+                scale = 1.0 / (len(self.G) - 1.0)
+                self._degree_centrality = {agent: degree * scale for agent, degree in zip(self.G.nodes(), degrees.tolist())}
+            else:
+                import networkx as nx
+                self._degree_centrality = nx.degree_centrality(self.get_networkx_graph())
+        return self._degree_centrality
+
+    def get_betweenness_centrality(self) -> dict[int, float]:
+        if self._betweenness_centrality is None:
+            import networkx as nx
+            self._betweenness_centrality = nx.betweenness_centrality(self.get_networkx_graph())
+        return self._betweenness_centrality
+
+    def get_closeness_centrality(self) -> dict[int, float]:
+        if self._closeness_centrality is None:
+            import networkx as nx
+            self._closeness_centrality = nx.closeness_centrality(self.get_networkx_graph())
+        return self._closeness_centrality
+
+    def get_predecessor_sets(self) -> dict[int, frozenset[int]]:
+        """
+        Returns a dictionary mapping each agent to the set of agents with an edge into it.
+        """
+        if self._predecessor_sets is None:
+            self._predecessor_sets = {agent: frozenset(self.G.predecessors(agent)) for agent in self.G.nodes()}
+        return self._predecessor_sets
+
+    def get_reachable_sets(self) -> dict[int, frozenset[int]]:
+        """
+        Returns a dictionary mapping each agent to the set of agents reachable from it (its descendants).
+        """
+        if self._reachable_sets is None:
+            if isinstance(self.G, AgentGraph):
+                closure = self.G.get_closure()
+                reachable = {
+                    agent: frozenset(b for b in range(1, len(self.G) + 1) if closure[agent] >> b & 1) for agent in self.G.nodes()
+                }
+            else:
+                import networkx as nx
+                if nx.is_directed_acyclic_graph(self.G):
+                    # Build each agent's descendants from those of its successors in reverse topological order
+                    reachable = {}
+                    for agent in reversed(list(nx.topological_sort(self.G))):
+                        descendants = set()
+                        for successor in self.G.successors(agent):
+                            descendants.add(successor)
+                            descendants.update(reachable[successor])
+                        reachable[agent] = frozenset(descendants)
+                else:
+                    reachable = {agent: frozenset(nx.descendants(self.G, agent)) for agent in self.G.nodes()}
+            self._reachable_sets = reachable
+        return self._reachable_sets
+
+    def get_descendant_counts(self) -> dict[int, int]:
+        """
+        Returns a dictionary mapping each agent to the number of agents reachable from it.
+        """
+        if self._descendant_counts is None:
+            if isinstance(self.G, AgentGraph):
+                closure = self.G.get_closure()
+                self._descendant_counts = {agent: bin(closure[agent]).count("1") for agent in self.G.nodes()}
+            else:
+                self._descendant_counts = {agent: len(reachable) for agent, reachable in self.get_reachable_sets().items()}
+        return self._descendant_counts
+
+    def is_reachable(self, source: int, target: int) -> bool:
+        """
+        Returns whether `target` can be reached from `source` through the graph.
+        """
+        if isinstance(self.G, AgentGraph):
+            return self.G.is_reachable(source, target)
+        return target in self.get_reachable_sets()[source]
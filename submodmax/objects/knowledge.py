@@ -0,0 +1,48 @@
+from collections.abc import Mapping
+
+UNKNOWN = 0
+
+class AgentKnowledge(Mapping):
+    """
+    The knowledge an agent has of the decisions made by other agents, stored sparsely. Only the decisions the agent
+    has learned are kept, together with an integer bitset of the targets known to be taken (bit t is set if some known
+    agent chose target t), so checking whether a target is already taken is O(1).
+
+    `AgentKnowledge` can be passed to the existing information sharing rules in place of a knowledge dictionary. Agents
+    whose decisions are unknown read as UNKNOWN and iteration only visits the known agents (in increasing order).
+    """
+    __slots__ = ("decisions", "known_targets")
+
+    def __init__(self):
+        self.decisions = {}
+        self.known_targets = 0
+
+    def learn(self, agent: int, choice: int):
+        """
+        Records that `agent` chose the target `choice`.
+        """
+        previous = self.decisions.get(agent, UNKNOWN)
+        self.decisions[agent] = choice
+        if previous and previous != choice and previous > 0:
+            # A known decision was overwritten, so the bitset has to be rebuilt from the remaining decisions
+            self.known_targets = 0
+            for target in self.decisions.values():
+                if target and target > 0:
+                    self.known_targets |= 1 << target
+        elif choice and choice > 0:
+            self.known_targets |= 1 << choice
+
+    def knows_target(self, target: int) -> bool:
+        """
+        Returns whether `target` is known to have been chosen by some agent.
+        """
+        return bool(self.known_targets >> target & 1)
+
+    def __getitem__(self, agent: int) -> int:
+        return self.decisions.get(agent, UNKNOWN)
+
+    def __iter__(self):
+        return iter(sorted(self.decisions))
+
+    def __len__(self) -> int:
+        return len(self.decisions)
@@ -1,53 +1,313 @@
-import networkx as nx
+from __future__ import annotations
+import hashlib
 import itertools
+import numpy as np
+from typing import TYPE_CHECKING
+from submodmax.objects.agent_graph import AgentGraph
 from submodmax.objects.assignment import Assignment
-from submodmax.utils.assignment_utils import score_assignment
+from submodmax.objects.graph_metrics import GraphMetrics
+from submodmax.objects.scenario_views import ActionSetView, TargetValueView
+from submodmax.utils.assignment_utils import score_assignment, max_weight_matching_choices
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+OPTIMAL_SOLVERS = ("matching", "brute_force")
 
 class Scenario:
+    """
+    A scenario stored in a compact, array-backed form:
+
+    - `action_indptr` / `action_indices` hold the action sets in CSR form (int32). The action set of agent `a` is
+      `action_indices[action_indptr[a - 1]:action_indptr[a]]`.
+    - `values_array` holds the target values, where `values_array[t]` is the value of target `t` (index 0 is unused).
+    - `edges` is an (E, 2) int32 array holding the edges of the information sharing graph over the agents 1, ..., n.
+
+    The dictionary and graph getters (`get_action_set`, `get_target_values`, `get_graph`) are views built on top of
+    these arrays. `get_graph` returns an immutable `AgentGraph` built once per scenario, while `get_graph_copy`
+    materializes a new `nx.DiGraph`.
+    """
     def __init__(
-        self, 
-        G: nx.DiGraph, 
-        action_sets: dict[int, list[int]], 
+        self,
+        G: nx.DiGraph | AgentGraph,
+        action_sets: dict[int, list[int]],
         target_values: dict[int, int],
-        nbr: int = None
+        nbr: int = None,
+        optimal_solver: str = "matching",
+        optimal_assignment: Assignment = None,
+        optimal_value: float = None
     ):
-        self.G = G
-        self.action_sets = action_sets
-        self.target_values = target_values
+        """
+        Args:
+            G (nx.DiGraph | AgentGraph): The directed graph representing which agents share information with which other
+                agents.
+            action_sets (dict[int, list[int]]): A dictionary mapping agents (1, ..., n) to their corresponding action sets.
+            target_values (dict[int, int]): A dictionary mapping targets (1, ..., m) to their corresponding values.
+            nbr (int): An optional number identifying the scenario.
+            optimal_solver (str): The solver used to compute the optimal assignment ('matching' or 'brute_force').
+            optimal_assignment (Assignment): A known optimal assignment (e.g. loaded from a file). If None, it is
+                computed on the first call to `get_optimal_assignment` or `get_optimal_value`.
+            optimal_value (float): A known optimal value (e.g. from an LP). If provided, `get_optimal_value` returns it
+                without computing an optimal assignment.
+        """
+        agent_count = len(action_sets)
+        if sorted(action_sets.keys()) != list(range(1, agent_count + 1)):
+            raise ValueError("Action sets must be given for the agents 1, ..., n.")
+        if sorted(target_values.keys()) != list(range(1, len(target_values) + 1)):
+            raise ValueError("Target values must be given for the targets 1, ..., m.")
+
+        action_indptr = np.zeros(agent_count + 1, dtype=np.int32)
+        action_indptr[1:] = np.cumsum([len(action_sets[agent]) for agent in range(1, agent_count + 1)])
+        action_indices = np.fromiter(
+            (target for agent in range(1, agent_count + 1) for target in action_sets[agent]),
+            dtype=np.int32,
+            count=action_indptr[-1]
+        )
+        values_array = np.asarray([0] + [target_values[target] for target in range(1, len(target_values) + 1)])
+        if isinstance(G, AgentGraph):
+            if len(G) != agent_count:
+                raise ValueError("The graph must have one node per agent.")
+            edges = G.get_edges()
+        else:
+            edges = np.array(list(G.edges()), dtype=np.int32).reshape(-1, 2)
+
+        self._initialize(
+            agent_count, action_indptr, action_indices, values_array, edges,
+            nbr, optimal_solver, optimal_assignment, optimal_value
+        )
+        if isinstance(G, AgentGraph):
+            self.graph = G
+
+    @classmethod
+    def from_arrays(
+        cls,
+        agent_count: int,
+        action_indptr: np.ndarray,
+        action_indices: np.ndarray,
+        values_array: np.ndarray,
+        edges: np.ndarray,
+        nbr: int = None,
+        optimal_solver: str = "matching",
+        optimal_assignment: Assignment = None,
+        optimal_value: float = None
+    ) -> 'Scenario':
+        """
+        Creates a `Scenario` directly from its compact array representation (see the class docstring) without copying
+        the arrays.
+        """
+        scenario = cls.__new__(cls)
+        scenario._initialize(
+            agent_count, action_indptr, action_indices, values_array, np.asarray(edges).reshape(-1, 2),
+            nbr, optimal_solver, optimal_assignment, optimal_value
+        )
+        return scenario
+
+    def _initialize(
+        self,
+        agent_count: int,
+        action_indptr: np.ndarray,
+        action_indices: np.ndarray,
+        values_array: np.ndarray,
+        edges: np.ndarray,
+        nbr: int,
+        optimal_solver: str,
+        optimal_assignment: Assignment,
+        optimal_value: float
+    ):
+        if optimal_solver not in OPTIMAL_SOLVERS:
+            raise ValueError(f"Unknown optimal solver '{optimal_solver}'. Options are {OPTIMAL_SOLVERS}.")
+        if len(action_indptr) != agent_count + 1:
+            raise ValueError("The action set index pointer must have one entry per agent plus one.")
+        self.agent_count = agent_count
+        self.action_indptr = action_indptr
+        self.action_indices = action_indices
+        self.values_array = values_array
+        self.edges = edges
         self.nbr = nbr
-        self.optimal_assignment = self.brute_force_optimal_solution()
-        self.optimal_value = self.optimal_assignment.get_value() if self.optimal_assignment != None else None
+        self.optimal_solver = optimal_solver
+        self.optimal_assignment = None
+        self.optimal_value = optimal_value
+        self.graph = None
+        self.graph_metrics = None
+        self.content_hash = None
+        self.assignments = {}
+        if optimal_assignment is not None:
+            self.set_optimal_assignment(optimal_assignment)
+
+    def __getstate__(self) -> dict:
+        # Cached graph metrics can be rebuilt from the edges, so they are not pickled (e.g. when sent between processes)
+        state = self.__dict__.copy()
+        state['graph_metrics'] = None
+        return state
+
+    def compute_optimal_solution(self, solver: str = None) -> Assignment:
+        """
+        Computes the optimal assignment of agents to targets with the given `solver` ('matching' or 'brute_force').
+        If no `solver` is given, the scenario's `optimal_solver` is used.
+        """
+        solver = solver or self.optimal_solver
+        if solver == "matching":
+            return self.matching_optimal_solution()
+        if solver == "brute_force":
+            return self.brute_force_optimal_solution()
+        raise ValueError(f"Unknown optimal solver '{solver}'. Options are {OPTIMAL_SOLVERS}.")
 
     def brute_force_optimal_solution(self) -> Assignment:
         """
         Computes the optimal assignment of agents to targets by generating all possible assignments and scoring them.
+        This is exponential in the number of agents and is kept as a verification oracle for `matching_optimal_solution`.
         """
-        
+
         basf = None
         basf_val = -1
-        keys = list(self.action_sets.keys())
-        action_sets = [s[:] if s else [None] for s in self.action_sets.values()]
-        possibilities = [
-            Assignment(dict(zip(keys, values))) for values in itertools.product(*action_sets)
-        ]
+        action_sets = self.get_action_set()
+        target_values = self.get_target_values()
+        keys = list(action_sets.keys())
+        options = [s[:] if s else [None] for s in action_sets.values()]
 
-        for assignment in possibilities:
-            sol_val = score_assignment(assignment, self.target_values)
+        for choices in itertools.product(*options):
+            sol_val = sum(target_values[choice] for choice in set(choices) if choice)
             if sol_val > basf_val:
-                basf = assignment
+                basf = choices
                 basf_val = sol_val
-        
-        optimal_assignment = basf
+
+        optimal_assignment = Assignment(dict(zip(keys, basf)))
         optimal_assignment.set_value(basf_val)
         optimal_assignment.set_efficiency(1.0)
         return optimal_assignment
 
+    def matching_optimal_solution(self) -> Assignment:
+        """
+        Computes the optimal assignment of agents to targets as a maximum-weight bipartite matching between agents and
+        the targets in their action sets (solved with the Hungarian method). Because each target's value is counted at most
+        once, agents left unmatched by the matching can select any target in their action set without changing the value
+        of the assignment.
+        """
+
+        action_sets = [
+            self.action_indices[self.action_indptr[agent]:self.action_indptr[agent + 1]] for agent in range(self.agent_count)
+        ]
+        choices = max_weight_matching_choices(action_sets, self.values_array)
+
+        optimal_assignment = Assignment(dict(zip(range(1, self.agent_count + 1), choices)))
+        optimal_assignment.set_value(score_assignment(optimal_assignment, self.get_target_values()))
+        optimal_assignment.set_efficiency(1.0)
+        return optimal_assignment
+
+    def get_content_hash(self) -> str:
+        """
+        Returns a hash (hex SHA-256 digest) of the content of the scenario: its agent count, action sets (in order),
+        target values and set of edges. Scenarios with the same content have the same hash, regardless of how they were
+        built, of the order their edges were given in and of the dtype of their target values. The scenario number and
+        known optimum are not part of the hash.
+        """
+        if self.content_hash is None:
+            edge_keys = np.unique(self.edges[:, 0].astype(np.int64) * (self.agent_count + 1) + self.edges[:, 1])
+            digest = hashlib.sha256(b"submodmax.Scenario/1")
+            for array in (
+                np.array([self.agent_count, len(self.action_indices), len(self.values_array), len(edge_keys)]),
+                self.action_indptr,
+                self.action_indices,
+                self.values_array,
+                edge_keys
+            ):
+                dtype = '<f8' if array is self.values_array else '<i8'
+                digest.update(np.ascontiguousarray(array, dtype=dtype).tobytes())
+            self.content_hash = digest.hexdigest()
+        return self.content_hash
+
+    def cache_assignment(self, algorithm: str, assignment: Assignment):
+        """
+        Stores the assignment produced by `algorithm` (e.g. its title in a simulation) on the scenario, keyed by
+        (`algorithm`, rule used), so that it can be queried later without running the algorithm again.
+        """
+        self.assignments[(algorithm, assignment.get_rule_used())] = assignment
+
+    def get_assignment_by_algorithm(self, algorithm: str, rule: str = None) -> Assignment:
+        """
+        Returns the cached assignment produced by `algorithm` (see `cache_assignment`). If `rule` is None, the algorithm
+        must have been cached with a single rule (or none). Raises a `KeyError` if there is no matching assignment.
+        """
+        if rule is not None:
+            assignment = self.assignments.get((algorithm, rule))
+            if assignment is not None:
+                return assignment
+        else:
+            matches = [assignment for (alg, _), assignment in self.assignments.items() if alg == algorithm]
+            if len(matches) == 1:
+                return matches[0]
+            if matches:
+                raise KeyError(f"Algorithm '{algorithm}' was cached with several rules; specify one.")
+        raise KeyError(f"No assignment cached for algorithm '{algorithm}' and rule '{rule}'.")
+
+    def get_cached_assignments(self) -> dict[tuple[str, str], Assignment]: return self.assignments
+
     def assign_number(self, nbr: int):
         self.nbr = nbr
 
-    def get_graph_copy(self) -> nx.DiGraph: return self.G.copy()
-    def get_action_set(self) -> dict[int, list[int]]: return self.action_sets
-    def get_target_values(self) -> dict[int, int]: return self.target_values
+    def set_optimal_assignment(self, assignment: Assignment):
+        """
+        Supplies a known optimal assignment so that it does not need to be computed. If no optimal value has been
+        supplied, the value of the assignment is used.
+        """
+        if assignment.get_value() is None:
+            assignment.set_value(score_assignment(assignment, self.get_target_values()))
+        assignment.set_efficiency(1.0)
+        self.optimal_assignment = assignment
+        if self.optimal_value is None:
+            self.optimal_value = assignment.get_value()
+
+    def set_optimal_value(self, value: float):
+        """
+        Supplies a known optimal value so that `get_optimal_value` does not need to compute an optimal assignment.
+        """
+        self.optimal_value = value
+
+    def has_optimal_value(self) -> bool: return self.optimal_value is not None
+
+    def get_graph(self) -> AgentGraph:
+        """
+        Returns the information sharing graph as an immutable `AgentGraph`, creating it on the first call.
+        """
+        if self.graph is None:
+            self.graph = AgentGraph(self.agent_count, self.edges)
+        return self.graph
+
+    def get_graph_copy(self) -> nx.DiGraph:
+        """
+        Returns a new `nx.DiGraph` containing the agents 1, ..., n and the edges of the information sharing graph.
+        """
+        return self.get_graph().to_networkx()
+
+    def get_graph_metrics(self) -> GraphMetrics:
+        """
+        Returns the cached `GraphMetrics` of the information sharing graph, creating it on the first call.
+        """
+        if self.graph_metrics is None:
+            self.graph_metrics = GraphMetrics(self.get_graph())
+        return self.graph_metrics
+
+    def get_agent_count(self) -> int: return self.agent_count
+    def get_target_count(self) -> int: return len(self.values_array) - 1
+    def get_edges(self) -> np.ndarray: return self.edges
+    def get_action_set(self) -> dict[int, list[int]]: return ActionSetView(self.action_indptr, self.action_indices)
+    def get_target_values(self) -> dict[int, int]: return TargetValueView(self.values_array)
     def get_nbr(self) -> int: return self.nbr
-    def get_optimal_assignment(self) -> Assignment: return self.optimal_assignment
-    def get_optimal_value(self) -> int: return self.optimal_assignment.get_value()
\ No newline at end of file
+    def get_optimal_solver(self) -> str: return self.optimal_solver
+
+    def get_optimal_assignment(self) -> Assignment:
+        """
+        Returns the optimal assignment of the scenario, computing it on the first call.
+        """
+        if self.optimal_assignment is None:
+            self.set_optimal_assignment(self.compute_optimal_solution())
+        return self.optimal_assignment
+
+    def get_optimal_value(self) -> int:
+        """
+        Returns the optimal value of the scenario, computing an optimal assignment on the first call if no optimal
+        value was supplied.
+        """
+        if self.optimal_value is None:
+            self.get_optimal_assignment()
+        return self.optimal_value
\ No newline at end of file
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import numpy as np
+from submodmax.objects.scenario import Scenario
+from submodmax.utils.assignment_utils import max_weight_matching_choices
+
+PADDING = 0
+
+class ScenarioBatch:
+    """
+    A batch of N scenarios with the same number of agents packed into NumPy arrays so that algorithms can be evaluated
+    across every scenario at once.
+
+    - `action_matrix` is an (N, agent_count, max_action_set_size) integer array where `action_matrix[s, i]` holds the
+      action set of agent i + 1 in scenario s, padded with 0 (no target).
+    - `value_matrix` is an (N, max_target + 1) array where `value_matrix[s, t]` is the value of target t in scenario s.
+      Column 0 corresponds to the padding target and always has a value of 0.
+    - `optimal_values` is an (N,) array holding the optimal value of each scenario.
+    """
+    def __init__(
+        self,
+        action_matrix: np.ndarray,
+        value_matrix: np.ndarray,
+        optimal_values: np.ndarray = None
+    ):
+        if action_matrix.ndim != 3 or value_matrix.ndim != 2 or len(action_matrix) != len(value_matrix):
+            raise ValueError("Expected an (N, agents, actions) action matrix and an (N, targets + 1) value matrix.")
+        self.action_matrix = action_matrix
+        self.value_matrix = value_matrix
+        self.optimal_values = optimal_values
+
+    @classmethod
+    def from_scenarios(cls, scenarios: list[Scenario]) -> 'ScenarioBatch':
+        """
+        Packs a list of scenarios sharing the same number of agents into a `ScenarioBatch`. The optimal value of each
+        scenario is taken from the scenario itself (and computed there if needed).
+        """
+        agent_counts = {scenario.get_agent_count() for scenario in scenarios}
+        if len(agent_counts) != 1:
+            raise ValueError(f"All scenarios in a batch must have the same number of agents, got {sorted(agent_counts)}.")
+        agent_count = agent_counts.pop()
+        action_width = max(int(np.diff(s.action_indptr).max(initial=0)) for s in scenarios)
+        target_width = max(len(s.values_array) for s in scenarios)
+
+        action_matrix = np.full((len(scenarios), agent_count, max(action_width, 1)), PADDING, dtype=np.int32)
+        value_matrix = np.zeros((len(scenarios), target_width))
+        optimal_values = np.zeros(len(scenarios))
+        for s, scenario in enumerate(scenarios):
+            action_sizes = np.diff(scenario.action_indptr)
+            slots = np.arange(len(scenario.action_indices)) - np.repeat(scenario.action_indptr[:-1], action_sizes)
+            action_matrix[s, np.repeat(np.arange(agent_count), action_sizes), slots] = scenario.action_indices
+            value_matrix[s, :len(scenario.values_array)] = scenario.values_array
+            optimal_values[s] = scenario.get_optimal_value()
+        return cls(action_matrix, value_matrix, optimal_values)
+
+    def __len__(self) -> int: return len(self.action_matrix)
+
+    def get_agent_count(self) -> int: return self.action_matrix.shape[1]
+    def get_action_matrix(self) -> np.ndarray: return self.action_matrix
+    def get_value_matrix(self) -> np.ndarray: return self.value_matrix
+
+    def get_optimal_values(self) -> np.ndarray:
+        """
+        Returns the optimal value of every scenario in the batch, computing them with a maximum-weight matching
+        the first time if they were not supplied.
+        """
+        if self.optimal_values is None:
+            optimal_values = np.zeros(len(self))
+            for s in range(len(self)):
+                action_sets = [row[row != PADDING] for row in self.action_matrix[s]]
+                choices = max_weight_matching_choices(action_sets, self.value_matrix[s])
+                optimal_values[s] = self.value_matrix[s, sorted({c for c in choices if c})].sum()
+            self.optimal_values = optimal_values
+        return self.optimal_values
@@ -0,0 +1,56 @@
+from __future__ import annotations
+import numpy as np
+from collections.abc import Mapping
+from numbers import Integral
+
+class ActionSetView(Mapping):
+    """
+    A read-only dictionary view (agent -> action set) over the CSR-style arrays that store the action sets of a `Scenario`.
+    The action set of agent `a` is `indices[indptr[a - 1]:indptr[a]]`.
+    """
+    __slots__ = ("indptr", "indices")
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray):
+        self.indptr = indptr
+        self.indices = indices
+
+    def __getitem__(self, agent: int) -> list[int]:
+        if not isinstance(agent, Integral) or not 1 <= agent < len(self.indptr):
+            raise KeyError(agent)
+        return self.indices[self.indptr[agent - 1]:self.indptr[agent]].tolist()
+
+    def __iter__(self):
+        return iter(range(1, len(self.indptr)))
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+class TargetValueView(Mapping):
+    """
+    A read-only dictionary view (target -> value) over the array that stores the target values of a `Scenario`.
+    Index 0 of the array is unused since targets are numbered from 1.
+    """
+    __slots__ = ("values_array",)
+
+    def __init__(self, values_array: np.ndarray):
+        self.values_array = values_array
+
+    def __getitem__(self, target: int) -> int | float:
+        if not isinstance(target, Integral) or not 1 <= target < len(self.values_array):
+            raise KeyError(target)
+        return self.values_array[target].item()
+
+    def __iter__(self):
+        return iter(range(1, len(self.values_array)))
+
+    def __len__(self) -> int:
+        return len(self.values_array) - 1
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def copy(self) -> dict[int, int]:
+        return dict(self)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Any
+from submodmax.objects.scenario import Scenario
+from submodmax.objects.assignment import Assignment
+from submodmax.globals import DEFAULT_ARC
+
+DEFAULT_RENDER_WORKERS = min(4, os.cpu_count() or 1)
+
+class FigureRenderer:
+    """
+    Renders figures in a pool of worker processes using matplotlib's headless Agg backend, so that plotting does not
+    block the process that produces the results. Jobs are queued with `submit_best_worst`, which returns right away;
+    `wait` (or leaving a `with` block) blocks until every queued figure has been written.
+
+    matplotlib is only imported by the workers. With `workers=0`, figures are rendered in the calling process as they
+    are submitted (with whatever backend it uses). Workers are forked where the platform supports it and spawned
+    otherwise (e.g. on Windows), in which case the calling script must guard its entry point with
+    `if __name__ == "__main__":`.
+    """
+    def __init__(self, workers: int = DEFAULT_RENDER_WORKERS):
+        """
+        Args:
+            workers (int): The number of rendering processes. The pool is started when the first job is submitted.
+        """
+        self.workers = workers
+        self.pool = None
+        self.futures = []
+
+    def __enter__(self) -> 'FigureRenderer':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close(wait=exc_info[0] is None)
+
+    def submit_best_worst(
+        self,
+        best: list[tuple[Scenario, Assignment]],
+        worst: list[tuple[Scenario, Assignment]],
+        scenario_type: str,
+        algorithm_title: str,
+        output_dir: str,
+        arc_rads_scale: float = DEFAULT_ARC
+    ) -> Future:
+        """
+        Queues a `visualize_best_worst_scenarios` figure. Returns a future holding the path of the saved figure.
+        """
+        return self._submit(_render_best_worst, best, worst, scenario_type, algorithm_title, output_dir, arc_rads_scale)
+
+    def _submit(self, job, *args: Any) -> Future:
+        if self.workers <= 0:
+            future = Future()
+            try:
+                future.set_result(job(*args))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            if self.pool is None:
+                # Forked workers start right away without re-importing the calling script
+                context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+                self.pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=context, initializer=_use_headless_backend
+                )
+            future = self.pool.submit(job, *args)
+        self.futures.append(future)
+        return future
+
+    def pending(self) -> int:
+        """Returns the number of queued figures that have not been written yet."""
+        return sum(not future.done() for future in self.futures)
+
+    def wait(self) -> list[str]:
+        """
+        Blocks until every queued figure has been written and returns their paths (in submission order). Raises the
+        exception of the first job that failed.
+        """
+        futures, self.futures = self.futures, []
+        return [future.result() for future in futures]
+
+    def close(self, wait: bool = True):
+        """
+        Shuts the pool down, after waiting for the queued figures if `wait` is True (otherwise pending jobs are
+        cancelled).
+        """
+        try:
+            if wait:
+                self.wait()
+        finally:
+            if not wait:
+                for future in self.futures:
+                    future.cancel()
+                self.futures = []
+            if self.pool is not None:
+                self.pool.shutdown(wait=wait)
+                self.pool = None
+
+def _use_headless_backend():
+    import matplotlib
+    matplotlib.use("Agg")
+
+def _render_best_worst(
+    best: list[tuple[Scenario, Assignment]],
+    worst: list[tuple[Scenario, Assignment]],
+    scenario_type: str,
+    algorithm_title: str,
+    output_dir: str,
+    arc_rads_scale: float
+) -> str:
+    from submodmax.visualize import visualize_best_worst_scenarios
+    return visualize_best_worst_scenarios(best, worst, scenario_type, algorithm_title, output_dir, arc_rads_scale)
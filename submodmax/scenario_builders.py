@@ -1,15 +1,33 @@
-import networkx as nx
 import random
 from typing import Callable
 from submodmax.objects.scenario import Scenario
+from submodmax.graph_generators import (
+    line_graph, pass_to_last_graph, paired_graph, random_linearized_dag, random_dag_by_probability, layered_dag, k_out_dag
+)
 from submodmax.action_target_generators import default_target_generator
-from submodmax.visualize import visualize_scenario
+from submodmax.utils.rule_utils import supported_keyword_arguments
+
+def _view(scenario: Scenario):
+    # The plotting dependencies are only imported when a scenario is actually viewed
+    from submodmax.visualize import visualize_scenario
+    visualize_scenario(scenario, "Scenario Visualization")
+
+def _generate_targets(
+    target_generator: Callable[[int, int], tuple[dict[int, int], dict[int, int]]],
+    agent_count: int,
+    target_count: int,
+    rng: random.Random
+) -> tuple[dict[int, list[int]], dict[int, int]]:
+    if rng is None:
+        return target_generator(agent_count, target_count)
+    return target_generator(agent_count, target_count, **supported_keyword_arguments(target_generator, rng=rng))
 
 def generate_line_graph(
     agent_count: int, 
     target_count: int, 
     target_generator: Callable[[int, int], tuple[dict[int, int], dict[int, int]]] = default_target_generator, 
-    view: bool = False
+    view: bool = False,
+    rng: random.Random = None
 ) -> Scenario:
     """
     Generates a `Scenario` whose information sharing graph is a line graph. The `action_sets` and `target_values` are provided
@@ -21,17 +39,18 @@ def generate_line_graph(
         target_generator (Callable[[int, int], tuple[dict[int, int], dict[int, int]]]): A function that generates `action_sets` and
             `target_values` based on the `agent_count` and `target_count`.
         view (bool): Determines whether (True) or not (False) the `Scenario` will be viewed after creation.
+        rng (random.Random): The random number generator passed to the `target_generator` (if it accepts one) and used
+            to generate the graph. If None, the global `random` module is used.
     
     Returns:
         Scenario: the generated `Scenario`.
     """
     
     
-    G = nx.DiGraph()
-    G.add_edges_from([(u, u + 1) for u in range(1, agent_count)])
-    action_sets, target_values = target_generator(agent_count, target_count)
+    G = line_graph(agent_count)
+    action_sets, target_values = _generate_targets(target_generator, agent_count, target_count, rng)
     s = Scenario(G, action_sets, target_values)
-    if view: visualize_scenario(s, "Scenario Visualization")
+    if view: _view(s)
     return s
 
 def generate_random_linearized_dag(
@@ -39,7 +58,8 @@ def generate_random_linearized_dag(
     target_count: int,
     edge_count: int,
     target_generator: Callable[[int, int], tuple[dict[int, int], dict[int, int]]] = default_target_generator,
-    view: bool = False
+    view: bool = False,
+    rng: random.Random = None
 ) -> Scenario:
     """
     Generates a `Scenario` whose information sharing graph is a randomly generated linearized DAG. The `action_sets` and `target_values` are provided
@@ -51,32 +71,29 @@ def generate_random_linearized_dag(
         target_generator (Callable[[int, int], tuple[dict[int, int], dict[int, int]]]): A function that generates `action_sets` and
             `target_values` based on the `agent_count` and `target_count`.
         view (bool): Determines whether (True) or not (False) the `Scenario` will be viewed after creation.
+        rng (random.Random): The random number generator passed to the `target_generator` (if it accepts one) and used
+            to generate the graph. If None, the global `random` module is used.
     
     Returns:
         Scenario: the generated `Scenario`.
     """
     
-    G = nx.DiGraph()
-    G.add_nodes_from(range(1, agent_count + 1))
-    
-    possible_edges = [(u, v) for u in range(1, agent_count + 1) for v in range(u+1, agent_count + 1)]
-    
-    if edge_count > len(possible_edges):
+    if edge_count > agent_count * (agent_count - 1) // 2:
         print("Too many edges requested for DAG of given size.")
         return None
 
-    chosen_edges = random.sample(possible_edges, edge_count)
-    G.add_edges_from(chosen_edges)
-    action_sets, target_values = target_generator(agent_count, target_count)
+    G = random_linearized_dag(agent_count, edge_count, rng)
+    action_sets, target_values = _generate_targets(target_generator, agent_count, target_count, rng)
     s = Scenario(G, action_sets, target_values)
-    if view: visualize_scenario(s, "Scenario Visualization")
+    if view: _view(s)
     return s
 
 def pass_to_last(
     agent_count: int,
     target_count: int,
     target_generator: Callable[[int, int], tuple[dict[int, int], dict[int, int]]] = default_target_generator,
-    view: bool = False
+    view: bool = False,
+    rng: random.Random = None
 ):
     """
     Generates a `Scenario` whose information sharing graph contains only edges connecting each agent to the final
@@ -88,23 +105,25 @@ def pass_to_last(
         target_generator (Callable[[int, int], tuple[dict[int, int], dict[int, int]]]): A function that generates `action_sets` and
             `target_values` based on the `agent_count` and `target_count`.
         view (bool): Determines whether (True) or not (False) the `Scenario` will be viewed after creation.
+        rng (random.Random): The random number generator passed to the `target_generator` (if it accepts one) and used
+            to generate the graph. If None, the global `random` module is used.
     
     Returns:
         Scenario: the generated `Scenario`.
     """
     
-    G = nx.DiGraph()
-    G.add_edges_from([(u, agent_count) for u in range(1, agent_count)])
-    action_sets, target_values = target_generator(agent_count, target_count)
+    G = pass_to_last_graph(agent_count)
+    action_sets, target_values = _generate_targets(target_generator, agent_count, target_count, rng)
     s = Scenario(G, action_sets, target_values)
-    if view: visualize_scenario(s, "Scenario Visualization")
+    if view: _view(s)
     return s
 
 def pair_agents(
     agent_count: int,
     target_count: int,
     target_generator: Callable[[int, int], tuple[dict[int, int], dict[int, int]]] = default_target_generator,
-    view: bool = False
+    view: bool = False,
+    rng: random.Random = None
 ):
     """
     Generates a `Scenario` whose information sharing graph contains an edge from every odd numbered agent to the following agent (if one exists) . The `action_sets` and `target_values` are provided by the given `target_generator` function.
@@ -115,15 +134,116 @@ def pair_agents(
         target_generator (Callable[[int, int], tuple[dict[int, int], dict[int, int]]]): A function that generates `action_sets` and
             `target_values` based on the `agent_count` and `target_count`.
         view (bool): Determines whether (True) or not (False) the `Scenario` will be viewed after creation.
+        rng (random.Random): The random number generator passed to the `target_generator` (if it accepts one) and used
+            to generate the graph. If None, the global `random` module is used.
+    
+    Returns:
+        Scenario: the generated `Scenario`.
+    """
+
+    G = paired_graph(agent_count)
+    action_sets, target_values = _generate_targets(target_generator, agent_count, target_count, rng)
+    s = Scenario(G, action_sets, target_values)
+    if view: _view(s)
+    return s
+
+def generate_random_dag_by_probability(
+    agent_count: int,
+    target_count: int,
+    edge_probability: float,
+    target_generator: Callable[[int, int], tuple[dict[int, int], dict[int, int]]] = default_target_generator,
+    view: bool = False,
+    rng: random.Random = None
+) -> Scenario:
+    """
+    Generates a `Scenario` whose information sharing graph is a random linearized DAG in which each possible edge is
+    present with probability `edge_probability`. The `action_sets` and `target_values` are provided by the given
+    `target_generator` function.
+
+    Args:
+        agent_count (int): The number of agents to be present in the scenario.
+        target_count (int): The number of targets to be present in the scenario.
+        edge_probability (float): The probability that each possible edge is present.
+        target_generator (Callable[[int, int], tuple[dict[int, int], dict[int, int]]]): A function that generates `action_sets` and
+            `target_values` based on the `agent_count` and `target_count`.
+        view (bool): Determines whether (True) or not (False) the `Scenario` will be viewed after creation.
+        rng (random.Random): The random number generator passed to the `target_generator` (if it accepts one) and used
+            to generate the graph. If None, the global `random` module is used.
     
     Returns:
         Scenario: the generated `Scenario`.
     """
 
-    G = nx.DiGraph()
-    G.add_nodes_from(range(1, agent_count + 1))
-    G.add_edges_from([(u, u + 1) for u in range(1, agent_count, 2)])
-    action_sets, target_values = target_generator(agent_count, target_count)
+    G = random_dag_by_probability(agent_count, edge_probability, rng)
+    action_sets, target_values = _generate_targets(target_generator, agent_count, target_count, rng)
     s = Scenario(G, action_sets, target_values)
-    if view: visualize_scenario(s, "Scenario Visualization")
-    return s
\ No newline at end of file
+    if view: _view(s)
+    return s
+
+def generate_layered_dag(
+    agent_count: int,
+    target_count: int,
+    layer_count: int,
+    edge_probability: float,
+    target_generator: Callable[[int, int], tuple[dict[int, int], dict[int, int]]] = default_target_generator,
+    view: bool = False,
+    rng: random.Random = None
+) -> Scenario:
+    """
+    Generates a `Scenario` whose information sharing graph is a layered DAG: the agents are split into `layer_count`
+    consecutive layers and each possible edge between consecutive layers is present with probability `edge_probability`.
+    The `action_sets` and `target_values` are provided by the given `target_generator` function.
+
+    Args:
+        agent_count (int): The number of agents to be present in the scenario.
+        target_count (int): The number of targets to be present in the scenario.
+        layer_count (int): The number of layers.
+        edge_probability (float): The probability that each possible edge between consecutive layers is present.
+        target_generator (Callable[[int, int], tuple[dict[int, int], dict[int, int]]]): A function that generates `action_sets` and
+            `target_values` based on the `agent_count` and `target_count`.
+        view (bool): Determines whether (True) or not (False) the `Scenario` will be viewed after creation.
+        rng (random.Random): The random number generator passed to the `target_generator` (if it accepts one) and used
+            to generate the graph. If None, the global `random` module is used.
+    
+    Returns:
+        Scenario: the generated `Scenario`.
+    """
+
+    G = layered_dag(agent_count, layer_count, edge_probability, rng)
+    action_sets, target_values = _generate_targets(target_generator, agent_count, target_count, rng)
+    s = Scenario(G, action_sets, target_values)
+    if view: _view(s)
+    return s
+
+def generate_k_out_dag(
+    agent_count: int,
+    target_count: int,
+    k: int,
+    target_generator: Callable[[int, int], tuple[dict[int, int], dict[int, int]]] = default_target_generator,
+    view: bool = False,
+    rng: random.Random = None
+) -> Scenario:
+    """
+    Generates a `Scenario` whose information sharing graph is a random linearized DAG in which every agent shares
+    information with `k` later agents chosen at random. The `action_sets` and `target_values` are provided by the given
+    `target_generator` function.
+
+    Args:
+        agent_count (int): The number of agents to be present in the scenario.
+        target_count (int): The number of targets to be present in the scenario.
+        k (int): The number of agents each agent shares information with.
+        target_generator (Callable[[int, int], tuple[dict[int, int], dict[int, int]]]): A function that generates `action_sets` and
+            `target_values` based on the `agent_count` and `target_count`.
+        view (bool): Determines whether (True) or not (False) the `Scenario` will be viewed after creation.
+        rng (random.Random): The random number generator passed to the `target_generator` (if it accepts one) and used
+            to generate the graph. If None, the global `random` module is used.
+    
+    Returns:
+        Scenario: the generated `Scenario`.
+    """
+
+    G = k_out_dag(agent_count, k, rng)
+    action_sets, target_values = _generate_targets(target_generator, agent_count, target_count, rng)
+    s = Scenario(G, action_sets, target_values)
+    if view: _view(s)
+    return s
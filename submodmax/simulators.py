@@ -1,15 +1,33 @@
+from __future__ import annotations
 import os
 import csv
-import numpy as np
-from collections import defaultdict
-from typing import Callable, Any, Dict
+import math
+import pickle
+import time
+import random
+from concurrent.futures import ProcessPoolExecutor, Future
+from collections import defaultdict, deque
+from typing import Callable, Any, Dict, Iterator, NamedTuple
 from submodmax.objects.scenario import Scenario
 from submodmax.objects.assignment import Assignment
-from submodmax.visualize import visualize_best_worst_scenarios
 from submodmax.globals import DEFAULT_OUT_DIR
+from submodmax.utils.statistics_utils import StreamingStats, BoundedExtremes
+from submodmax.utils.random_utils import derive_rng, derive_seed
+from submodmax.utils.run_store import RunStore
+from submodmax.utils.rule_utils import supported_keyword_arguments
+from submodmax.utils.profiling import Profiler, NULL_PROFILER
+from submodmax.utils.optimum_cache import OptimumCache
+from submodmax.utils.scenario_corpus import ScenarioCorpus
+from submodmax.rendering import FigureRenderer
+from submodmax.batch_algorithms import BATCH_ALGORITHMS
+
+VISUALIZED_EXTREMES = 5
+# Runs per chunk sent to a worker and chunks in flight per worker, so that memory is constant in the number of runs
+MAX_CHUNK_RUNS = 64
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
 
 def algorithms_versus_scenarios(
-    scenario_builders: list[Callable[..., Scenario]],
+    scenario_builders: list[Callable[..., Scenario] | ScenarioCorpus],
     scenario_builder_params: list[list[Any]],
     scenario_type_titles: list[str],
     algorithms: list[Callable[..., Assignment]],
@@ -18,72 +36,431 @@ def algorithms_versus_scenarios(
     runs_per_scenario: int = 1000,
     create_visuals: bool = False,
     out_directory: str = DEFAULT_OUT_DIR,
+    workers: int = 1,
+    seed: int = None,
+    run_store: str | RunStore = None,
+    resume: bool = False,
+    profiler: Profiler = None,
+    renderer: FigureRenderer = None,
+    optimum_cache: str | OptimumCache = None,
 ):
+    """
+    Runs every algorithm on `runs_per_scenario` scenarios of each scenario type and writes summary statistics of the
+    resulting solution values and efficiencies to CSV files in `out_directory`.
+
+    Args:
+        scenario_builders (list[Callable[..., Scenario] | ScenarioCorpus]): The function used to build scenarios of each
+            type, or a `ScenarioCorpus` whose scenarios are used in order (run `i` uses scenario `i`).
+        scenario_builder_params (list[list[Any]]): The parameters passed to each scenario builder (ignored for a
+            corpus).
+        scenario_type_titles (list[str]): The title of each scenario type.
+        algorithms (list[Callable[..., Assignment]]): The algorithms to be evaluated.
+        algorithm_params (list[list[Any]]): The parameters passed to each algorithm (after the scenario).
+        algorithm_titles (list[str]): The title of each algorithm.
+        runs_per_scenario (int): The number of scenarios built for each scenario type.
+        create_visuals (bool): Determines whether (True) or not (False) the best and worst scenarios of each
+            (scenario type, algorithm) pair are visualized. The figures are rendered in background processes (see
+            `renderer`).
+        out_directory (str): The directory where the results are written.
+        workers (int): The number of processes the runs are sharded across. With more than one worker, the builders,
+            algorithms and their parameters must be picklable (e.g. module-level functions) and scripts using this
+            function should guard their entry point with `if __name__ == "__main__":`.
+        seed (int): If provided, every run gets its own random number generators derived from (`seed`, scenario type
+            index, run index): one passed as `rng` to the scenario builder and one per algorithm passed as `rng` to
+            algorithms that accept it. Results are then reproducible, identical regardless of the number of workers,
+            and any single run can be rebuilt on its own with `rebuild_scenario`. If None, the global `random`
+            module is used.
+        run_store (str | RunStore): A directory (or `RunStore`) where a record of every (run, algorithm) pair is
+            appended: scenario type, run index, run seed, algorithm, rule, value, efficiency and time. Records are
+            flushed to disk in chunks as the simulation progresses.
+        resume (bool): If True, runs already recorded in `run_store` (for every algorithm) are not simulated again;
+            their stored values and efficiencies are used instead. Requires a `seed`.
+        profiler (Profiler): If provided, the wall time and number of calls of each phase are recorded: 'build/<scenario
+            type>', 'optimum/<scenario type>', 'algorithm/<scenario type>/<algorithm>', 'rule/<rule>' (for algorithms
+            accepting a `profiler` keyword argument), 'write_csv', 'visualize' (queuing the figures) and
+            'visualize_wait'. The throughput is printed while running and the timings are written to 'timings.csv' in
+            `out_directory`.
+        renderer (FigureRenderer): The renderer the figures are queued on. If provided, this function returns as soon
+            as the figures are queued and the caller is responsible for waiting on (or closing) the renderer. If None,
+            a renderer is created and the figures are all written before this function returns.
+        optimum_cache (str | OptimumCache): A directory (or `OptimumCache`) where the optimum of every scenario is
+            cached by content hash. Scenarios already solved (in this or an earlier simulation) are not solved again.
+    
+    Returns:
+        dict: For each (scenario type, algorithm) pair, the `StreamingStats` of the solution values ('values') and
+            efficiencies ('effs'), and a `BoundedExtremes` holding the (scenario, assignment) pairs with the highest
+            and lowest efficiencies ('extremes', only filled if `create_visuals` is True).
+    """
+    for build, stype in zip(scenario_builders, scenario_type_titles):
+        if isinstance(build, ScenarioCorpus) and len(build) < runs_per_scenario:
+            raise ValueError(
+                f"The corpus of scenario type '{stype}' holds {len(build)} scenarios, fewer than the {runs_per_scenario} runs."
+            )
     os.makedirs(out_directory, exist_ok=True)
+    profiler = profiler or NULL_PROFILER
+    profiler.start()
+    if optimum_cache is not None and not isinstance(optimum_cache, OptimumCache):
+        optimum_cache = OptimumCache(optimum_cache)
 
     # Data accumulators
-    stats = defaultdict(lambda: defaultdict(lambda: {'values': [], 'effs': [], 'assignments': []}))
+    # Streaming statistics keep memory constant in `runs_per_scenario`, and only the best and worst five
+    # (scenario, assignment) pairs of each (scenario type, algorithm) pair are retained for the visuals
+    stats = defaultdict(lambda: defaultdict(lambda: {
+        'values': StreamingStats(), 'effs': StreamingStats(), 'extremes': BoundedExtremes(VISUALIZED_EXTREMES)
+    }))
+
+    # Per-run records are appended to the run store (if any) and runs already stored are skipped when resuming
+    store = None
+    if run_store is not None:
+        store = run_store if isinstance(run_store, RunStore) else RunStore(run_store)
+    if resume and (store is None or seed is None):
+        raise ValueError("Resuming a simulation requires both a `run_store` and a `seed`.")
+    if workers > 1 and seed is None:
+        # Workers must not share the parent's random state, otherwise they would build the same scenarios. The seed is
+        # drawn before anything is stored, so that the stored runs can be rebuilt.
+        seed = random.randrange(2**32)
+    if store is not None and seed is not None:
+        store.set_seed(seed)
+    stored_runs = [
+        store.stored_runs(stype, algorithm_titles) if resume else {} for stype in scenario_type_titles
+    ]
+    missing_runs = [
+        [run for run in range(runs_per_scenario) if run not in stored_runs[stype_idx]]
+        for stype_idx in range(len(scenario_type_titles))
+    ]
 
     # --- RUN SIMULATIONS ---
-    for stype_idx, stype in enumerate(scenario_type_titles):
-        build = scenario_builders[stype_idx]
-        build_params = scenario_builder_params[stype_idx]
-        for run in range(runs_per_scenario):
-            scenario = build(*build_params)
-            scenario.assign_number(run + 1)
-            for alg_idx, alg_title in enumerate(algorithm_titles):
-                alg = algorithms[alg_idx]
-                params = algorithm_params[alg_idx]
-                assignment: Assignment = alg(scenario, *params)
-                stats[stype][alg_title]['values'].append(assignment.value)
-                stats[stype][alg_title]['effs'].append(assignment.efficiency)
-                if create_visuals:
-                    stats[stype][alg_title]['assignments'].append((scenario, assignment))
+    pool = None
+    if workers > 1:
+        _check_picklable(scenario_builders, scenario_builder_params, algorithms, algorithm_params)
+        pool = ProcessPoolExecutor(max_workers=workers)
+    simulated_runs = []
+    try:
+        simulated_runs = [
+            _iter_simulated_runs(
+                pool, workers, scenario_builders[stype_idx], scenario_builder_params[stype_idx], stype_idx,
+                missing_runs[stype_idx], algorithms, algorithm_params, seed, create_visuals,
+                profiler, scenario_type_titles[stype_idx], algorithm_titles, optimum_cache
+            )
+            for stype_idx in range(len(scenario_type_titles))
+        ]
+        for stype_idx, stype in enumerate(scenario_type_titles):
+            for run in range(runs_per_scenario):
+                if run in stored_runs[stype_idx]:
+                    _record_stored_run(stats[stype], algorithm_titles, stype_idx, run, stored_runs[stype_idx][run], create_visuals)
+                    continue
+                scenario, assignments, times = next(simulated_runs[stype_idx])
+                _record_runs(stats[stype], algorithm_titles, [(scenario, assignments)], create_visuals)
+                profiler.record_scenario(stype, run + 1, runs_per_scenario)
+                if store is not None:
+                    run_seed = derive_seed(seed, stype_idx, run) if seed is not None else None
+                    for alg_title, assignment, elapsed in zip(algorithm_titles, assignments, times):
+                        store.append(
+                            stype, run, run_seed, alg_title, assignment.get_rule_used(),
+                            assignment.get_value(), assignment.get_efficiency(), elapsed
+                        )
+                    store.maybe_flush()
+    finally:
+        for runs in simulated_runs:
+            runs.close()
+        if pool is not None:
+            pool.shutdown()
+        if store is not None:
+            store.flush()
 
     # --- WRITE CSV STATISTICS ---
     for metric, filename in [('values', 'solution_values.csv'), ('effs', 'solution_efficiencies.csv')]:
         path = os.path.join(out_directory, filename)
-        with open(path, 'w', newline='') as f:
+        with profiler.phase('write_csv'), open(path, 'w', newline='') as f:
             writer = csv.writer(f)
             header = ['scenario_type', 'algorithm', 'mean', 'median', 'min', 'max', 'std', 'num_runs']
             writer.writerow(header)
             for stype in scenario_type_titles:
                 for alg in algorithm_titles:
-                    arr = np.array(stats[stype][alg][metric])
-                    if arr.size == 0:
+                    metric_stats: StreamingStats = stats[stype][alg][metric]
+                    if metric_stats.get_count() == 0:
                         continue
                     writer.writerow([
                         stype, alg,
-                        f"{np.mean(arr):.3f}",
-                        f"{np.median(arr):.3f}",
-                        f"{np.min(arr):.3f}",
-                        f"{np.max(arr):.3f}",
-                        f"{np.std(arr, ddof=1):.3f}",
-                        arr.size
+                        f"{metric_stats.get_mean():.3f}",
+                        f"{metric_stats.get_median():.3f}",
+                        f"{metric_stats.get_min():.3f}",
+                        f"{metric_stats.get_max():.3f}",
+                        f"{metric_stats.get_std(ddof=1):.3f}",
+                        metric_stats.get_count()
                     ])
 
         print(f"Wrote {metric} stats to {path}")
 
-    # --- CREATE VISUALIZATIONS (sorted by efficiency) ---
+    # --- CREATE VISUALIZATIONS (ranked by efficiency) ---
     if create_visuals and runs_per_scenario >= 10:
-        for stype in scenario_type_titles:
-            for alg in algorithm_titles:
-                data = stats[stype][alg]['assignments']
-                if len(data) >= 10:
-                    # Sort by assignment efficiency
-                    data_sorted = sorted(data, key=lambda sa: sa[1].efficiency)
-
-                    # Worst 5: lowest to higher efficiency
-                    worst_5 = data_sorted[:5]
-
-                    # Best 5: highest to lower efficiency
-                    best_5 = data_sorted[-5:][::-1]
-
-                    visualize_best_worst_scenarios(
-                        best=best_5,
-                        worst=worst_5,
-                        scenario_type=stype,
-                        algorithm_title=alg,
-                        output_dir=out_directory
-                    )
-    return stats 
\ No newline at end of file
+        # Figures are rendered in background processes. A renderer supplied by the caller is left running, so that the
+        # results are returned as soon as the figures are queued
+        own_renderer = renderer is None
+        renderer = renderer or FigureRenderer()
+        try:
+            for stype in scenario_type_titles:
+                for alg in algorithm_titles:
+                    extremes: BoundedExtremes = stats[stype][alg]['extremes']
+                    if len(extremes) >= 10:
+                        # Runs read back from the run store are rebuilt from their seed
+                        resolve = lambda item: _resolve_extreme(
+                            item, scenario_builders, scenario_builder_params, algorithms, algorithm_params,
+                            algorithm_titles, seed
+                        )
+
+                        # Worst 5: lowest to higher efficiency
+                        worst_5 = [resolve(item) for item in extremes.get_lowest()]
+
+                        # Best 5: highest to lower efficiency
+                        best_5 = [resolve(item) for item in extremes.get_highest()]
+
+                        with profiler.phase('visualize'):
+                            renderer.submit_best_worst(
+                                best=best_5,
+                                worst=worst_5,
+                                scenario_type=stype,
+                                algorithm_title=alg,
+                                output_dir=out_directory
+                            )
+        finally:
+            if own_renderer:
+                with profiler.phase('visualize_wait'):
+                    renderer.close()
+
+    # --- WRITE TIMINGS ---
+    if profiler.enabled:
+        path = os.path.join(out_directory, 'timings.csv')
+        profiler.write_csv(path)
+        print(f"Wrote timings to {path} ({profiler.get_throughput():.1f} scenarios/sec)")
+    return stats 
+
+def _iter_simulated_runs(
+    pool: ProcessPoolExecutor,
+    workers: int,
+    build: Callable[..., Scenario] | ScenarioCorpus,
+    build_params: list[Any],
+    stype_idx: int,
+    runs: list[int],
+    algorithms: list[Callable[..., Assignment]],
+    algorithm_params: list[list[Any]],
+    seed: int,
+    keep_scenarios: bool,
+    profiler: Profiler,
+    stype: str,
+    algorithm_titles: list[str],
+    optimum_cache: OptimumCache
+) -> Iterator[tuple[Scenario, list[Assignment], list[float]]]:
+    """
+    Yields the results of `_simulate_runs` for each of the given runs, in order. With a pool, the runs are submitted
+    in chunks, keeping a bounded number of chunks in flight, and the timings recorded by each worker are merged into
+    `profiler`.
+    """
+    if pool is None:
+        return (
+            result for start in range(0, len(runs), MAX_CHUNK_RUNS)
+            for result in _simulate_runs(
+                build, build_params, stype_idx, runs[start:start + MAX_CHUNK_RUNS], algorithms, algorithm_params, seed,
+                keep_scenarios, profiler, stype, algorithm_titles, optimum_cache
+            )[0]
+        )
+    chunk_size = min(MAX_CHUNK_RUNS, max(1, math.ceil(len(runs) / (4 * workers))))
+    submit = lambda chunk: pool.submit(
+        _simulate_runs, build, build_params, stype_idx, chunk, algorithms, algorithm_params, seed, keep_scenarios,
+        profiler.spawn(), stype, algorithm_titles, optimum_cache
+    )
+    chunks = (runs[start:start + chunk_size] for start in range(0, len(runs), chunk_size))
+    return _merged_results(submit, chunks, CHUNKS_IN_FLIGHT_PER_WORKER * workers, profiler)
+
+def _merged_results(
+    submit: Callable[[list[int]], Future],
+    chunks: Iterator[list[int]],
+    window: int,
+    profiler: Profiler
+) -> Iterator[tuple[Scenario, list[Assignment], list[float]]]:
+    """
+    Submits each chunk of runs with `submit` (keeping at most `window` chunks in flight) and yields their results in
+    order. Each future is dropped as soon as its results are taken, and the chunks still pending are cancelled when
+    the iterator is closed.
+    """
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < window:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.append(submit(chunk))
+            if not pending:
+                return
+            results, chunk_profiler = pending.popleft().result()
+            profiler.merge(chunk_profiler)
+            yield from results
+    finally:
+        # Chunks that have not started yet are dropped when the simulation stops early (or the iterator is closed)
+        for future in pending:
+            future.cancel()
+
+def _simulate_runs(
+    build: Callable[..., Scenario] | ScenarioCorpus,
+    build_params: list[Any],
+    stype_idx: int,
+    runs: list[int],
+    algorithms: list[Callable[..., Assignment]],
+    algorithm_params: list[list[Any]],
+    seed: int,
+    keep_scenarios: bool,
+    profiler: Profiler,
+    stype: str,
+    algorithm_titles: list[str],
+    optimum_cache: OptimumCache = None
+) -> tuple[list[tuple[Scenario, list[Assignment], list[float]]], Profiler]:
+    """
+    Builds a scenario for each run in `runs` and evaluates every algorithm on it. Returns a (scenario, assignments,
+    times) triple per run, where the scenario is None unless `keep_scenarios` is True and `times` holds the wall time
+    (in seconds) taken by each algorithm, along with `profiler` (holding the timings of each phase).
+
+    Algorithms with a batch version in `BATCH_ALGORITHMS` (and no parameters) are evaluated over all the scenarios at
+    once after they are built, and their time is split evenly between the scenarios. The optimal values are still
+    resolved one scenario at a time (from `optimum_cache` or the corpus where possible), which is the main remaining
+    per-scenario cost of such algorithms.
+    """
+    # The other algorithms run on each scenario as it is built, so that runs drawing from the global `random` module
+    # stay in the same order
+    batched = [
+        alg_idx for alg_idx, (alg, params) in enumerate(zip(algorithms, algorithm_params))
+        if alg in BATCH_ALGORITHMS and not params
+    ]
+    scenarios, results = [], []
+    for run in runs:
+        with profiler.phase(f"build/{stype}"):
+            scenario = rebuild_scenario(build, build_params, seed, stype_idx, run)
+        # The optimal value is computed up front so that it is not counted in the time of the first algorithm
+        with profiler.phase(f"optimum/{stype}"):
+            if optimum_cache is not None:
+                optimum_cache.resolve_optimum(scenario)
+            else:
+                scenario.get_optimal_value()
+        assignments, times = [None] * len(algorithms), [0.0] * len(algorithms)
+        for alg_idx, (alg, params) in enumerate(zip(algorithms, algorithm_params)):
+            if alg_idx in batched:
+                continue
+            with profiler.phase(f"algorithm/{stype}/{algorithm_titles[alg_idx]}"):
+                start = time.perf_counter()
+                assignments[alg_idx] = _run_algorithm(alg, params, scenario, seed, stype_idx, run, alg_idx, profiler)
+                times[alg_idx] = time.perf_counter() - start
+        scenarios.append(scenario)
+        results.append((scenario if keep_scenarios else None, assignments, times))
+
+    for alg_idx in batched:
+        start = time.perf_counter()
+        batch_assignments = BATCH_ALGORITHMS[algorithms[alg_idx]](scenarios)
+        elapsed = time.perf_counter() - start
+        profiler.add(f"algorithm/{stype}/{algorithm_titles[alg_idx]}", elapsed, len(scenarios))
+        for (_, assignments, times), assignment in zip(results, batch_assignments):
+            assignments[alg_idx] = assignment
+            times[alg_idx] = elapsed / len(scenarios)
+
+    for scenario, (_, assignments, _) in zip(scenarios, results):
+        for alg_title, assignment in zip(algorithm_titles, assignments):
+            scenario.cache_assignment(alg_title, assignment)
+    return results, profiler
+
+def _run_algorithm(
+    alg: Callable[..., Assignment],
+    params: list[Any],
+    scenario: Scenario,
+    seed: int,
+    stype_idx: int,
+    run: int,
+    alg_idx: int,
+    profiler: Profiler = NULL_PROFILER
+) -> Assignment:
+    extras = {} if seed is None else {'rng': derive_rng(seed, stype_idx, run, alg_idx)}
+    if profiler.enabled:
+        extras['profiler'] = profiler
+    alg_kwargs = supported_keyword_arguments(alg, **extras) if extras else {}
+    return alg(scenario, *params, **alg_kwargs)
+
+def rebuild_scenario(
+    build: Callable[..., Scenario] | ScenarioCorpus,
+    build_params: list[Any],
+    seed: int,
+    stype_idx: int,
+    run: int
+) -> Scenario:
+    """
+    Builds the scenario used in run `run` (0-indexed) of the scenario type with index `stype_idx` of a simulation seeded
+    with `seed`. With a seed, the scenario is identical to the one built during the simulation. With a corpus, scenario
+    `run` of the corpus is returned.
+    """
+    if isinstance(build, ScenarioCorpus):
+        scenario = build.get_scenario(run)
+        scenario.assign_number(run + 1)
+        return scenario
+    build_kwargs = {} if seed is None else supported_keyword_arguments(build, rng=derive_rng(seed, stype_idx, run))
+    scenario = build(*build_params, **build_kwargs)
+    scenario.assign_number(run + 1)
+    return scenario
+
+def _record_runs(
+    stype_stats: Dict[str, Dict[str, Any]],
+    algorithm_titles: list[str],
+    runs: list[tuple[Scenario, list[Assignment]]],
+    keep_assignments: bool
+):
+    for scenario, assignments in runs:
+        for alg_title, assignment in zip(algorithm_titles, assignments):
+            stype_stats[alg_title]['values'].update(assignment.value)
+            stype_stats[alg_title]['effs'].update(assignment.efficiency)
+            if keep_assignments:
+                stype_stats[alg_title]['extremes'].push(assignment.efficiency, (scenario, assignment))
+
+def _record_stored_run(
+    stype_stats: Dict[str, Dict[str, Any]],
+    algorithm_titles: list[str],
+    stype_idx: int,
+    run: int,
+    results: list[tuple[float, float]],
+    keep_assignments: bool
+):
+    for alg_idx, (alg_title, (value, efficiency)) in enumerate(zip(algorithm_titles, results)):
+        stype_stats[alg_title]['values'].update(value)
+        stype_stats[alg_title]['effs'].update(efficiency)
+        if keep_assignments:
+            stype_stats[alg_title]['extremes'].push(efficiency, _StoredRun(stype_idx, run, alg_idx))
+
+class _StoredRun(NamedTuple):
+    stype_idx: int
+    run: int
+    alg_idx: int
+
+def _resolve_extreme(
+    item: tuple[Scenario, Assignment] | _StoredRun,
+    scenario_builders: list[Callable[..., Scenario] | ScenarioCorpus],
+    scenario_builder_params: list[list[Any]],
+    algorithms: list[Callable[..., Assignment]],
+    algorithm_params: list[list[Any]],
+    algorithm_titles: list[str],
+    seed: int
+) -> tuple[Scenario, Assignment]:
+    if not isinstance(item, _StoredRun):
+        return item
+    scenario = rebuild_scenario(
+        scenario_builders[item.stype_idx], scenario_builder_params[item.stype_idx], seed, item.stype_idx, item.run
+    )
+    assignment = _run_algorithm(
+        algorithms[item.alg_idx], algorithm_params[item.alg_idx], scenario, seed, item.stype_idx, item.run, item.alg_idx
+    )
+    scenario.cache_assignment(algorithm_titles[item.alg_idx], assignment)
+    return scenario, assignment
+
+def _check_picklable(*objects: Any):
+    for obj in objects:
+        try:
+            pickle.dumps(obj)
+        except Exception as e:
+            raise TypeError(
+                "Scenario builders, algorithms and their parameters must be picklable (e.g. module-level functions) "
+                f"to be run with more than one worker: {e}"
+            ) from e
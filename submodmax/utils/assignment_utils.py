@@ -1,3 +1,4 @@
+import numpy as np
 from submodmax.objects.assignment import Assignment
 
 def score_assignment(assignment: Assignment, target_values: dict[int, int]) -> float:
@@ -16,4 +17,35 @@ def score_assignment(assignment: Assignment, target_values: dict[int, int]) -> f
     for choice in unique_choices:
         if choice:
             score += target_values[choice]
-    return score
\ No newline at end of file
+    return score
+
+def max_weight_matching_choices(action_sets: list[list[int]], target_values: dict[int, int]) -> list[int]:
+    """
+    Return a choice of target for each agent that maximizes the sum of the uniquely selected targets' values, found as a
+    maximum-weight bipartite matching between agents and targets (Hungarian method). Agents left unmatched select the
+    first target in their action set (or None if their action set is empty), which does not change the value of the choices.
+
+    Args:
+        action_sets (list[list[int]]): The action set of each agent, in agent order.
+        target_values (dict[int, int]): A mapping (or array indexed by target) of targets to their values.
+    
+    Returns:
+        list[int]: The chosen target of each agent, in agent order.
+    """
+    # scipy.optimize is slow to import, so it is only loaded once a matching is needed
+    from scipy.optimize import linear_sum_assignment
+
+    targets = sorted({int(target) for action_set in action_sets for target in action_set})
+    target_columns = {target: col for col, target in enumerate(targets)}
+
+    weights = np.zeros((len(action_sets), len(targets)))
+    for row, action_set in enumerate(action_sets):
+        for target in action_set:
+            weights[row, target_columns[int(target)]] = target_values[target]
+
+    choices = [int(action_set[0]) if len(action_set) else None for action_set in action_sets]
+    rows, cols = linear_sum_assignment(weights, maximize=True)
+    for row, col in zip(rows, cols):
+        if weights[row, col] > 0:
+            choices[row] = targets[col]
+    return choices
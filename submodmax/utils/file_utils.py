@@ -0,0 +1,16 @@
+from __future__ import annotations
+import os
+import secrets
+
+def create_partial_file(path: str) -> tuple[int, str]:
+    """
+    Creates a new, uniquely named temporary file next to `path`, to be renamed onto `path` once it is complete. Unlike
+    `tempfile.mkstemp` (which creates files as 0600), the file gets the permissions of a regularly created file
+    (0666 masked by the umask). Returns its file descriptor (opened for writing) and its path.
+    """
+    while True:
+        tmp_path = f"{path}.{secrets.token_hex(8)}.partial"
+        try:
+            return os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666), tmp_path
+        except FileExistsError:
+            continue
@@ -0,0 +1,146 @@
+from __future__ import annotations
+import os
+import json
+import hashlib
+import numpy as np
+from collections import OrderedDict
+from submodmax.objects.scenario import Scenario
+from submodmax.utils.file_utils import create_partial_file
+from submodmax.objects.assignment import Assignment
+
+OPTIMUM_KEY = "optimum"
+
+class OptimumCache:
+    """
+    A cache of optimal assignments (and, optionally, algorithm results) keyed by the content hash of a scenario (see
+    `Scenario.get_content_hash`), so that scenarios that recur across runs or sweeps are only solved once.
+
+    Entries are kept in an in-memory LRU of at most `max_entries` entries, backed by an optional on-disk store in
+    `directory` holding one small JSON file per entry. Files are written to a temporary file and renamed into place,
+    so the store can be shared by any number of worker processes (and sweeps) without locking: a reader sees either
+    no entry or a complete one. When a cache is pickled (e.g. sent to a worker process), its in-memory entries are
+    left behind.
+    """
+    def __init__(self, directory: str = None, max_entries: int = 100000):
+        """
+        Args:
+            directory (str): The directory of the on-disk store. If None, entries are only kept in memory.
+            max_entries (int): The maximum number of entries kept in memory.
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['entries'] = OrderedDict()
+        return state
+
+    def get_optimum(self, scenario: Scenario) -> Assignment:
+        """
+        Returns the cached optimal assignment of `scenario`, or None if it is not cached.
+        """
+        return self._get(scenario.get_content_hash(), OPTIMUM_KEY)
+
+    def put_optimum(self, scenario: Scenario, assignment: Assignment):
+        """
+        Caches `assignment` as the optimal assignment of `scenario`.
+        """
+        self._put(scenario.get_content_hash(), OPTIMUM_KEY, assignment)
+
+    def resolve_optimum(self, scenario: Scenario) -> Assignment:
+        """
+        Supplies the cached optimal assignment to `scenario` or, if there is none, computes it and caches it. Scenarios
+        whose optimum is already known (e.g. read from a `ScenarioCorpus`) are left as they are, without hashing them.
+        Returns the optimal assignment, or None if only the optimal value of the scenario is known.
+        """
+        if scenario.has_optimal_value():
+            return scenario.optimal_assignment
+        assignment = self.get_optimum(scenario)
+        if assignment is not None:
+            scenario.set_optimal_assignment(assignment)
+            return assignment
+        assignment = scenario.get_optimal_assignment()
+        self.put_optimum(scenario, assignment)
+        return assignment
+
+    def get_result(self, scenario: Scenario, key: str) -> Assignment:
+        """
+        Returns the assignment cached for `scenario` under `key` (e.g. an algorithm and rule title), or None if it is
+        not cached. Only deterministic results should be cached.
+        """
+        return self._get(scenario.get_content_hash(), _result_key(key))
+
+    def put_result(self, scenario: Scenario, key: str, assignment: Assignment):
+        """
+        Caches `assignment` (with its value, efficiency, algorithm and rule) for `scenario` under `key`.
+        """
+        self._put(scenario.get_content_hash(), _result_key(key), assignment)
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Returns the number of lookups answered from memory ('hits'), from disk ('disk_hits') and not answered ('misses').
+        """
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses}
+
+    def _get(self, content_hash: str, key: str) -> Assignment:
+        entry = self.entries.get((content_hash, key))
+        if entry is not None:
+            self.entries.move_to_end((content_hash, key))
+            self.hits += 1
+            return _to_assignment(entry)
+        if self.directory is not None:
+            try:
+                with open(self._path(content_hash, key), encoding="utf-8") as f:
+                    entry = json.load(f)
+            except FileNotFoundError:
+                entry = None
+            if entry is not None:
+                self._remember(content_hash, key, entry)
+                self.disk_hits += 1
+                return _to_assignment(entry)
+        self.misses += 1
+        return None
+
+    def _put(self, content_hash: str, key: str, assignment: Assignment):
+        entry = {
+            'choices': assignment.get_choice_array().tolist(),
+            'value': _to_json_number(assignment.get_value()),
+            'efficiency': _to_json_number(assignment.get_efficiency()),
+            'algorithm_used': assignment.get_algorithm_used(),
+            'rule_used': assignment.get_rule_used(),
+        }
+        self._remember(content_hash, key, entry)
+        if self.directory is not None:
+            path = self._path(content_hash, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = create_partial_file(path)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+
+    def _remember(self, content_hash: str, key: str, entry: dict):
+        self.entries[(content_hash, key)] = entry
+        self.entries.move_to_end((content_hash, key))
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _path(self, content_hash: str, key: str) -> str:
+        return os.path.join(self.directory, content_hash[:2], f"{content_hash}.{key}.json")
+
+def _result_key(key: str) -> str:
+    return "result-" + hashlib.sha1(key.encode()).hexdigest()[:16]
+
+def _to_json_number(value: float) -> float:
+    return value.item() if isinstance(value, np.generic) else value
+
+def _to_assignment(entry: dict) -> Assignment:
+    return Assignment(
+        np.asarray(entry['choices'], dtype=np.int32), entry['value'], entry['efficiency'],
+        entry['algorithm_used'], entry['rule_used']
+    )
@@ -0,0 +1,166 @@
+from __future__ import annotations
+import csv
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from collections import defaultdict
+from typing import Callable, Any
+
+class Profiler:
+    """
+    A registry of named timers that records the wall time and number of calls of each phase of a simulation (building
+    scenarios, computing optimal values, running algorithms and rules, visualizing, ...).
+
+    Phases are timed with the `phase` context manager or by wrapping a function with `timed`. If `track_memory` is
+    True, the peak memory allocated during each `phase` is also tracked with `tracemalloc` (which slows Python down
+    considerably, so it is off by default). Profilers created in worker processes (see `spawn`) can be combined with
+    `merge`.
+    """
+    enabled = True
+
+    def __init__(self, track_memory: bool = False, progress_interval: float = 5.0):
+        """
+        Args:
+            track_memory (bool): Determines whether (True) or not (False) the peak memory of each phase is tracked.
+            progress_interval (float): The minimum number of seconds between two progress reports. If None, progress
+                is not reported.
+        """
+        self.track_memory = track_memory
+        self.progress_interval = progress_interval
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.peaks = {}
+        self.scenarios = 0
+        self.start()
+
+    def start(self):
+        """
+        Starts the wall clock used to compute the throughput.
+        """
+        self.start_time = time.perf_counter()
+        self.last_report = self.start_time
+
+    def add(self, name: str, elapsed: float, calls: int = 1):
+        """
+        Adds `elapsed` seconds and `calls` calls to the phase `name`.
+        """
+        self.totals[name] += elapsed
+        self.calls[name] += calls
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Times the body of a `with` block as one call of the phase `name`.
+        """
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+            if self.track_memory:
+                peak = tracemalloc.get_traced_memory()[1] - base
+                self.peaks[name] = max(self.peaks.get(name, 0), peak)
+
+    def timed(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Returns a wrapper of `func` that times each call as one call of the phase `name` (memory is not tracked).
+        """
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - start)
+        return wrapper
+
+    def spawn(self) -> 'Profiler':
+        """
+        Returns a new, empty profiler with the same settings (e.g. to be sent to a worker process and merged back).
+        """
+        return Profiler(self.track_memory, None)
+
+    def merge(self, other: 'Profiler'):
+        """
+        Adds the timings of `other` to this profiler.
+        """
+        for name, elapsed in other.totals.items():
+            self.add(name, elapsed, other.calls[name])
+        for name, peak in other.peaks.items():
+            self.peaks[name] = max(self.peaks.get(name, 0), peak)
+
+    def record_scenario(self, label: str, done: int, total: int):
+        """
+        Counts a completed scenario and prints the progress of `label` (`done` out of `total` scenarios) and the overall
+        throughput, at most once every `progress_interval` seconds.
+        """
+        self.scenarios += 1
+        if self.progress_interval is None:
+            return
+        now = time.perf_counter()
+        if now - self.last_report >= self.progress_interval or done == total:
+            self.last_report = now
+            print(f"{label}: {done}/{total} scenarios ({self.get_throughput():.1f} scenarios/sec)")
+
+    def get_elapsed(self) -> float: return time.perf_counter() - self.start_time
+
+    def get_throughput(self) -> float:
+        """
+        Returns the number of scenarios completed per second since the profiler was started.
+        """
+        elapsed = self.get_elapsed()
+        return self.scenarios / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> list[list[Any]]:
+        """
+        Returns a row per phase (in the order they were first recorded) holding the phase name, number of calls,
+        total time (s), mean time per call (ms) and peak memory (KiB, empty if memory is not tracked).
+        """
+        return [
+            [
+                name,
+                self.calls[name],
+                f"{total:.6f}",
+                f"{1e3 * total / self.calls[name]:.6f}" if self.calls[name] else "",
+                f"{self.peaks[name] / 1024:.1f}" if name in self.peaks else ""
+            ]
+            for name, total in self.totals.items()
+        ]
+
+    def write_csv(self, path: str):
+        """
+        Writes the `summary` of every phase to a CSV file at `path`, followed by a 'wall_clock' row holding the number
+        of scenarios and the total wall time.
+        """
+        elapsed = self.get_elapsed()
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['phase', 'calls', 'total_s', 'mean_ms', 'peak_memory_kib'])
+            writer.writerows(self.summary())
+            writer.writerow([
+                'wall_clock', self.scenarios, f"{elapsed:.6f}",
+                f"{1e3 * elapsed / self.scenarios:.6f}" if self.scenarios else "", ""
+            ])
+
+class NullProfiler(Profiler):
+    """
+    A profiler that records nothing, used when profiling is disabled so that instrumented code has (almost) no overhead.
+    """
+    enabled = False
+
+    def __init__(self):
+        super().__init__(track_memory=False, progress_interval=None)
+
+    def add(self, name: str, elapsed: float, calls: int = 1): pass
+    def phase(self, name: str): return _NULL_CONTEXT
+    def timed(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]: return func
+    def spawn(self) -> 'Profiler': return self
+    def merge(self, other: 'Profiler'): pass
+    def record_scenario(self, label: str, done: int, total: int): pass
+
+_NULL_CONTEXT = nullcontext()
+NULL_PROFILER = NullProfiler()
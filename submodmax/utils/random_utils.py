@@ -0,0 +1,27 @@
+from __future__ import annotations
+import random
+import hashlib
+import numpy as np
+
+def derive_seed(seed: int, *keys: int) -> int:
+    """
+    Derives a 64-bit seed from a base `seed` and a sequence of `keys` (e.g. a scenario type index and a run index).
+    Different keys give independent seeds and the same keys always give the same seed, regardless of the process.
+    """
+    digest = hashlib.sha256(repr((seed,) + tuple(keys)).encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+def derive_rng(seed: int, *keys: int) -> random.Random:
+    """
+    Returns a `random.Random` stream seeded with `derive_seed(seed, *keys)`.
+    """
+    return random.Random(derive_seed(seed, *keys))
+
+def numpy_generator(rng: random.Random | np.random.Generator = None) -> np.random.Generator:
+    """
+    Returns `rng` if it is a `np.random.Generator`, otherwise a new `np.random.Generator` seeded with 64 random bits
+    drawn from `rng` (or from the global `random` module if `rng` is None).
+    """
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng((rng or random).getrandbits(64))
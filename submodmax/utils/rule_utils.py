@@ -0,0 +1,21 @@
+from __future__ import annotations
+import inspect
+from functools import lru_cache
+from typing import Callable, Any
+
+@lru_cache(maxsize=None)
+def _keyword_parameters(func: Callable) -> tuple[frozenset[str], bool]:
+    parameters = inspect.signature(func).parameters.values()
+    names = frozenset(p.name for p in parameters if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY))
+    accepts_any = any(p.kind == p.VAR_KEYWORD for p in parameters)
+    return names, accepts_any
+
+def supported_keyword_arguments(func: Callable, **kwargs: Any) -> dict[str, Any]:
+    """
+    Returns the subset of `kwargs` that `func` accepts as keyword arguments. This allows optional extras (such as
+    precomputed graph metrics) to be passed to built-in rules without breaking user-defined rules that do not accept them.
+    """
+    names, accepts_any = _keyword_parameters(func)
+    if accepts_any:
+        return kwargs
+    return {key: value for key, value in kwargs.items() if key in names}
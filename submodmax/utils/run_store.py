@@ -0,0 +1,191 @@
+from __future__ import annotations
+import os
+import json
+import shutil
+import numpy as np
+from typing import Iterator
+
+RUN_STORE_VERSION = 1
+
+# Column name -> dtype. Text columns are stored as integer codes into the category lists of the schema.
+RUN_STORE_COLUMNS = {
+    'scenario_type': np.int32,
+    'run': np.int64,
+    'seed': np.uint64,
+    'algorithm': np.int32,
+    'rule': np.int32,
+    'value': np.float64,
+    'efficiency': np.float64,
+    'time': np.float64,
+}
+CATEGORICAL_COLUMNS = ('scenario_type', 'algorithm', 'rule')
+
+class RunStore:
+    """
+    A chunked, columnar store of per-run simulation records kept in a directory:
+
+    - `schema.json` holds the format version, the base seed of the sweep and the categories (strings) that the
+      codes of the text columns refer to.
+    - each `chunk_XXXXXX/` directory holds one `.npy` file per column (see `RUN_STORE_COLUMNS`).
+
+    Records are buffered in memory and written as a new chunk on `flush`. Chunks are written to a temporary directory
+    and renamed into place, so an interrupted sweep never leaves a partial chunk behind. Chunks can be read back
+    memory-mapped with `iter_chunks` without loading the whole store.
+    """
+    def __init__(self, directory: str, flush_every: int = 10000):
+        self.directory = directory
+        self.flush_every = flush_every
+        self.buffer = {column: [] for column in RUN_STORE_COLUMNS}
+        os.makedirs(directory, exist_ok=True)
+
+        schema_path = os.path.join(directory, "schema.json")
+        if os.path.exists(schema_path):
+            with open(schema_path, encoding="utf-8") as f:
+                schema = json.load(f)
+            if schema['version'] != RUN_STORE_VERSION:
+                raise ValueError(f"Unsupported run store version {schema['version']} in [{directory}].")
+            self.seed = schema['seed']
+            self.categories = schema['categories']
+        else:
+            self.seed = None
+            self.categories = {column: [] for column in CATEGORICAL_COLUMNS}
+        self.codes = {column: {c: i for i, c in enumerate(cats)} for column, cats in self.categories.items()}
+
+        # Remove chunks left half-written by an interrupted flush
+        for name in os.listdir(directory):
+            if name.endswith(".tmp"):
+                shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+    def get_seed(self) -> int: return self.seed
+
+    def set_seed(self, seed: int):
+        """
+        Records the base seed of the sweep. Resuming a store with a different seed raises a `ValueError`.
+        """
+        if self.seed is not None and seed != self.seed:
+            raise ValueError(f"Run store [{self.directory}] was created with seed {self.seed}, not {seed}.")
+        self.seed = seed
+        self._write_schema()
+
+    def get_categories(self, column: str) -> list[str]:
+        """Returns the strings that the codes of a text column refer to."""
+        return self.categories[column]
+
+    def _encode(self, column: str, text: str) -> int:
+        if text is None:
+            return -1
+        code = self.codes[column].get(text)
+        if code is None:
+            code = len(self.categories[column])
+            self.categories[column].append(text)
+            self.codes[column][text] = code
+        return code
+
+    def append(
+        self,
+        scenario_type: str,
+        run: int,
+        seed: int,
+        algorithm: str,
+        rule: str,
+        value: float,
+        efficiency: float,
+        time: float
+    ):
+        """
+        Buffers a record. A `rule` of None is stored as code -1 and an unseeded run has a `seed` of 0.
+        """
+        self.buffer['scenario_type'].append(self._encode('scenario_type', scenario_type))
+        self.buffer['run'].append(run)
+        self.buffer['seed'].append(seed or 0)
+        self.buffer['algorithm'].append(self._encode('algorithm', algorithm))
+        self.buffer['rule'].append(self._encode('rule', rule))
+        self.buffer['value'].append(value)
+        self.buffer['efficiency'].append(efficiency)
+        self.buffer['time'].append(time)
+
+    def buffered(self) -> int: return len(self.buffer['run'])
+
+    def maybe_flush(self):
+        """Flushes the buffer if it holds at least `flush_every` records."""
+        if self.buffered() >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered records as a new chunk."""
+        if not self.buffered():
+            return
+        self._write_schema()
+        name = f"chunk_{len(self._chunk_names()):06d}"
+        tmp_path = os.path.join(self.directory, name + ".tmp")
+        os.makedirs(tmp_path, exist_ok=True)
+        for column, dtype in RUN_STORE_COLUMNS.items():
+            np.save(os.path.join(tmp_path, f"{column}.npy"), np.asarray(self.buffer[column], dtype=dtype))
+        os.replace(tmp_path, os.path.join(self.directory, name))
+        self.buffer = {column: [] for column in RUN_STORE_COLUMNS}
+
+    def _write_schema(self):
+        schema = {'version': RUN_STORE_VERSION, 'seed': self.seed, 'categories': self.categories}
+        tmp_path = os.path.join(self.directory, "schema.json.partial")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(schema, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.directory, "schema.json"))
+
+    def _chunk_names(self) -> list[str]:
+        return sorted(n for n in os.listdir(self.directory) if n.startswith("chunk_") and not n.endswith(".tmp"))
+
+    def iter_chunks(self, columns: list[str] = None, mmap: bool = True) -> Iterator[dict[str, np.ndarray]]:
+        """
+        Yields the flushed chunks one at a time as dictionaries of column arrays. With `mmap` the arrays are
+        memory-mapped (read-only) rather than loaded.
+        """
+        columns = columns or list(RUN_STORE_COLUMNS)
+        for name in self._chunk_names():
+            yield {
+                column: np.load(os.path.join(self.directory, name, f"{column}.npy"), mmap_mode="r" if mmap else None)
+                for column in columns
+            }
+
+    def read(self, columns: list[str] = None) -> dict[str, np.ndarray]:
+        """
+        Returns the flushed records as a dictionary of concatenated column arrays.
+        """
+        columns = columns or list(RUN_STORE_COLUMNS)
+        chunks = list(self.iter_chunks(columns))
+        return {
+            column: np.concatenate([chunk[column] for chunk in chunks]) if chunks else np.empty(0, dtype=RUN_STORE_COLUMNS[column])
+            for column in columns
+        }
+
+    def stored_runs(self, scenario_type: str, algorithms: list[str]) -> dict[int, list[list[float]]]:
+        """
+        Returns the runs of `scenario_type` stored for every one of the given `algorithms`, mapping each run to the
+        [value, efficiency] pair of each algorithm (in the order given).
+        """
+        stype_code = self.codes['scenario_type'].get(scenario_type)
+        alg_codes = [self.codes['algorithm'].get(alg) for alg in algorithms]
+        if stype_code is None or None in alg_codes:
+            return {}
+        # Position of each algorithm code in `algorithms` (-1 for algorithms that were not asked for)
+        positions = np.full(max(alg_codes) + 1, -1, dtype=np.int64)
+        positions[alg_codes] = np.arange(len(alg_codes))
+        selected = []
+        for chunk in self.iter_chunks(['scenario_type', 'run', 'algorithm', 'value', 'efficiency']):
+            codes = chunk['algorithm'].astype(np.int64)
+            keep = (chunk['scenario_type'] == stype_code) & (codes < len(positions))
+            keep[keep] = positions[codes[keep]] >= 0
+            selected.append((chunk['run'][keep], positions[codes[keep]], chunk['value'][keep], chunk['efficiency'][keep]))
+        if not selected:
+            return {}
+        run, position, value, efficiency = (np.concatenate(column) for column in zip(*selected))
+
+        # The last record of each (run, algorithm) pair wins, and only runs stored for every algorithm are returned
+        runs, run_rows = np.unique(run, return_inverse=True)
+        keys = run_rows * len(algorithms) + position
+        last = len(keys) - 1 - np.unique(keys[::-1], return_index=True)[1]
+        results = np.zeros((len(runs), len(algorithms), 2))
+        stored = np.zeros((len(runs), len(algorithms)), dtype=bool)
+        results[run_rows[last], position[last]] = np.column_stack((value[last], efficiency[last]))
+        stored[run_rows[last], position[last]] = True
+        complete = stored.all(axis=1)
+        return dict(zip(runs[complete].tolist(), results[complete].tolist()))
@@ -0,0 +1,202 @@
+from __future__ import annotations
+import os
+import struct
+import numpy as np
+from typing import Iterable, Iterator
+from submodmax.objects.scenario import Scenario
+from submodmax.utils.file_utils import create_partial_file
+
+CORPUS_MAGIC = b"SMXCORP\0"
+CORPUS_VERSION = 1
+
+# Magic, version, value dtype code, then the scenario count and the total length of each concatenated array
+CORPUS_HEADER = struct.Struct("<8sII5Q")
+VALUE_DTYPES = {0: np.dtype('<i8'), 1: np.dtype('<f8')}
+NO_NUMBER = -1
+
+class ScenarioCorpus:
+    """
+    A fixed collection of scenarios read from a single binary corpus file (see `write_corpus`), so that algorithms can
+    be compared on exactly the same scenarios across sweeps. The file is memory-mapped and each scenario is a
+    zero-copy, read-only view into it: only the pages of the scenarios that are used are ever read.
+
+    The corpus layout (little-endian, each section aligned to 8 bytes) is:
+
+    - a header (`CORPUS_HEADER`): magic, format version, dtype of the target values, the number of scenarios N and the
+      lengths of the concatenated index pointer, action, value and edge arrays.
+    - per-scenario int64 offset arrays of length N + 1 into the index pointer, action, value and edge arrays.
+    - the number (int64, -1 if none) and precomputed optimal value (float64, NaN if unknown) of each scenario.
+    - the concatenated `action_indptr` (int32), `action_indices` (int32), `values_array` and `edges` (int32, (E, 2))
+      arrays of the scenarios (see `Scenario`).
+
+    A corpus can be passed to `algorithms_versus_scenarios` in place of a scenario builder, in which case run `i` uses
+    scenario `i`. When pickled (e.g. sent to a worker process), only its path is kept and the file is mapped again.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.getsize(path) < CORPUS_HEADER.size:
+            raise ValueError(f"[{path}] is not a scenario corpus.")
+        self.buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, version, value_code, count, indptr_total, action_total, value_total, edge_total = \
+            CORPUS_HEADER.unpack(self.buffer[:CORPUS_HEADER.size].tobytes())
+        if magic != CORPUS_MAGIC:
+            raise ValueError(f"[{path}] is not a scenario corpus.")
+        if version != CORPUS_VERSION:
+            raise ValueError(f"Unsupported scenario corpus version {version} in [{path}].")
+        if value_code not in VALUE_DTYPES:
+            raise ValueError(f"Unknown target value dtype code {value_code} in [{path}].")
+
+        sections = _section_layout(count, indptr_total, action_total, value_total, edge_total, VALUE_DTYPES[value_code])
+        if sections[-1][1] + sections[-1][2] * sections[-1][3].itemsize > len(self.buffer):
+            raise ValueError(f"Scenario corpus [{path}] is truncated.")
+        arrays = {
+            name: np.frombuffer(self.buffer, dtype=dtype, count=length, offset=offset)
+            for name, offset, length, dtype in sections
+        }
+        self.indptr_offsets = arrays['indptr_offsets']
+        self.action_offsets = arrays['action_offsets']
+        self.value_offsets = arrays['value_offsets']
+        self.edge_offsets = arrays['edge_offsets']
+        self.numbers = arrays['numbers']
+        self.optimal_values = arrays['optimal_values']
+        self.action_indptr = arrays['action_indptr']
+        self.action_indices = arrays['action_indices']
+        self.values = arrays['values']
+        self.edges = arrays['edges'].reshape(-1, 2)
+
+    def __getstate__(self) -> dict:
+        return {'path': self.path}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state['path'])
+
+    def __len__(self) -> int: return len(self.numbers)
+
+    def __getitem__(self, index: int) -> Scenario:
+        return self.get_scenario(index)
+
+    def __iter__(self) -> Iterator[Scenario]:
+        return (self.get_scenario(index) for index in range(len(self)))
+
+    def get_path(self) -> str: return self.path
+
+    def get_optimal_values(self) -> np.ndarray:
+        """Returns the precomputed optimal value of each scenario (NaN where it is unknown)."""
+        return self.optimal_values
+
+    def get_scenario(self, index: int) -> Scenario:
+        """
+        Returns scenario `index` (0-indexed) as a `Scenario` whose arrays are views into the memory-mapped file.
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"Scenario {index} is out of range for a corpus of {len(self)} scenarios.")
+        index %= len(self)
+        indptr = self.action_indptr[self.indptr_offsets[index]:self.indptr_offsets[index + 1]]
+        optimal_value = float(self.optimal_values[index])
+        if np.isnan(optimal_value):
+            optimal_value = None
+        elif self.values.dtype.kind == 'i':
+            optimal_value = int(optimal_value)
+        nbr = int(self.numbers[index])
+        return Scenario.from_arrays(
+            len(indptr) - 1,
+            indptr,
+            self.action_indices[self.action_offsets[index]:self.action_offsets[index + 1]],
+            self.values[self.value_offsets[index]:self.value_offsets[index + 1]],
+            self.edges[self.edge_offsets[index]:self.edge_offsets[index + 1]],
+            nbr=None if nbr == NO_NUMBER else nbr,
+            optimal_value=optimal_value
+        )
+
+def write_corpus(path: str, scenarios: Iterable[Scenario], include_optimal_values: bool = True) -> int:
+    """
+    Writes `scenarios` to a binary corpus file that can be read back with `ScenarioCorpus`. The file is written to a
+    temporary file and renamed into place, so an interrupted write never leaves a partial corpus behind.
+
+    Args:
+        path (str): The path of the corpus file.
+        scenarios (Iterable[Scenario]): The scenarios to be written, in order.
+        include_optimal_values (bool): Determines whether (True) or not (False) the optimal value of each scenario is
+            stored (computing it where it is not known yet).
+
+    Returns:
+        int: The number of scenarios written.
+    """
+    indptrs, actions, values, edges, numbers, optimal_values = [], [], [], [], [], []
+    for scenario in scenarios:
+        indptrs.append(np.asarray(scenario.action_indptr, dtype=np.int32))
+        actions.append(np.asarray(scenario.action_indices, dtype=np.int32))
+        values.append(np.asarray(scenario.values_array))
+        edges.append(np.asarray(scenario.get_edges(), dtype=np.int32).reshape(-1, 2))
+        numbers.append(NO_NUMBER if scenario.get_nbr() is None else scenario.get_nbr())
+        optimal_values.append(scenario.get_optimal_value() if include_optimal_values else np.nan)
+
+    # Integer target values are kept exact, anything else is stored as float64
+    value_code = 0 if all(v.dtype.kind in "iub" for v in values) else 1
+    value_dtype = VALUE_DTYPES[value_code]
+    offsets = lambda arrays: np.concatenate(([0], np.cumsum([len(a) for a in arrays], dtype=np.int64))).astype('<i8')
+    concat = lambda arrays, dtype, shape=(0,): np.concatenate(arrays).astype(dtype) if arrays else np.empty(shape, dtype=dtype)
+    arrays = {
+        'indptr_offsets': offsets(indptrs),
+        'action_offsets': offsets(actions),
+        'value_offsets': offsets(values),
+        'edge_offsets': offsets(edges),
+        'numbers': np.asarray(numbers, dtype='<i8'),
+        'optimal_values': np.asarray(optimal_values, dtype='<f8'),
+        'action_indptr': concat(indptrs, '<i4'),
+        'action_indices': concat(actions, '<i4'),
+        'values': concat(values, value_dtype),
+        'edges': concat(edges, '<i4', (0, 2)).reshape(-1),
+    }
+    header = CORPUS_HEADER.pack(
+        CORPUS_MAGIC, CORPUS_VERSION, value_code, len(numbers),
+        len(arrays['action_indptr']), len(arrays['action_indices']), len(arrays['values']), len(arrays['edges']) // 2
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = create_partial_file(path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            for name, offset, length, dtype in _section_layout(
+                len(numbers), len(arrays['action_indptr']), len(arrays['action_indices']), len(arrays['values']),
+                len(arrays['edges']) // 2, value_dtype
+            ):
+                f.write(b"\0" * (offset - f.tell()))
+                f.write(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return len(numbers)
+
+def _section_layout(
+    count: int,
+    indptr_total: int,
+    action_total: int,
+    value_total: int,
+    edge_total: int,
+    value_dtype: np.dtype
+) -> list[tuple[str, int, int, np.dtype]]:
+    """
+    Returns the (name, byte offset, length, dtype) of each section of a corpus, in file order.
+    """
+    sections = [
+        ('indptr_offsets', count + 1, np.dtype('<i8')),
+        ('action_offsets', count + 1, np.dtype('<i8')),
+        ('value_offsets', count + 1, np.dtype('<i8')),
+        ('edge_offsets', count + 1, np.dtype('<i8')),
+        ('numbers', count, np.dtype('<i8')),
+        ('optimal_values', count, np.dtype('<f8')),
+        ('action_indptr', indptr_total, np.dtype('<i4')),
+        ('action_indices', action_total, np.dtype('<i4')),
+        ('values', value_total, value_dtype),
+        ('edges', 2 * edge_total, np.dtype('<i4')),
+    ]
+    layout, offset = [], CORPUS_HEADER.size
+    for name, length, dtype in sections:
+        offset = (offset + 7) // 8 * 8
+        layout.append((name, offset, length, dtype))
+        offset += length * dtype.itemsize
+    return layout
@@ -1,12 +1,17 @@
+from __future__ import annotations
 import heapq
+from typing import Iterable
 from submodmax.objects.scenario import Scenario
 
-def get_scenario_efficiency(scenario: Scenario, algorithm: str):
-    assignment = scenario.get_assignment_by_algorithm(algorithm)
+# These queries read the assignments cached on each scenario (see `Scenario.cache_assignment`, filled by the
+# simulator), so no algorithm is run again. Each efficiency is looked up once per scenario and query.
+
+def get_scenario_efficiency(scenario: Scenario, algorithm: str, rule: str = None) -> float:
+    assignment = scenario.get_assignment_by_algorithm(algorithm, rule)
     return assignment.get_efficiency()
 
-def get_best_scenarios(scenarios: Scenario, algorithm: str, n=5):
-    return heapq.nlargest(n, scenarios, key=lambda s: get_scenario_efficiency(s, algorithm))
+def get_best_scenarios(scenarios: Iterable[Scenario], algorithm: str, n: int = 5, rule: str = None) -> list[Scenario]:
+    return heapq.nlargest(n, scenarios, key=lambda s: get_scenario_efficiency(s, algorithm, rule))
 
-def get_worst_scenarios(scenarios: Scenario, algorithm: str, n=5):
-    return heapq.nsmallest(n, scenarios, key=lambda s: get_scenario_efficiency(s, algorithm))
\ No newline at end of file
+def get_worst_scenarios(scenarios: Iterable[Scenario], algorithm: str, n: int = 5, rule: str = None) -> list[Scenario]:
+    return heapq.nsmallest(n, scenarios, key=lambda s: get_scenario_efficiency(s, algorithm, rule))
@@ -1,9 +1,11 @@
 import os
 import csv
-import tabulate
-import numpy as np
+import math
+import heapq
+from typing import Any
 
 def calc_stats(values: list[float]) -> dict[str, float]:
+    import numpy as np
     return {
         'min': round(float(np.min(values)), 3),
         'max': round(float(np.max(values)), 3),
@@ -41,6 +43,7 @@ def print_stats(stat_dict: dict[str, dict[str, dict[str, float]]], statistic: st
     Prints a table for the provided statistic from the stat_dict. The statistic options are 'min', 'max', 
     'median', 'mean', and 'std_dev'.
     """
+    import tabulate
     if not stat_dict:
         print("No data to display.")
         return
@@ -55,4 +58,174 @@ def print_stats(stat_dict: dict[str, dict[str, dict[str, float]]], statistic: st
             row.append(round(value, 3) if value is not None else "N/A")
         table.append(row)
     print(file=file)
-    print(tabulate.tabulate(table, headers=headers, tablefmt="plain"), file=file)
\ No newline at end of file
+    print(tabulate.tabulate(table, headers=headers, tablefmt="plain"), file=file)
+
+class StreamingQuantile:
+    """
+    Tracks a quantile of a stream of values in constant memory. The quantile is exact while the stream contains at most
+    `max_distinct` distinct values (a histogram of the values is kept). Beyond that, the histogram is dropped and the
+    P² algorithm (Jain & Chlamtac, 1985) estimates the quantile with five markers, initialized from the exact histogram.
+    """
+    def __init__(self, p: float = 0.5, max_distinct: int = 10000):
+        self.p = p
+        self.max_distinct = max(max_distinct, 5)
+        self.count = 0
+        self.histogram = {}
+        self.heights = None
+        self.positions = None
+        self.desired = None
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def update(self, x: float):
+        self.count += 1
+        if self.histogram is not None:
+            self.histogram[x] = self.histogram.get(x, 0) + 1
+            if len(self.histogram) > self.max_distinct:
+                self._start_estimation()
+            return
+
+        q, n = self.heights, self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Adjust the heights of the middle markers that are off their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                parabolic = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if q[i - 1] < parabolic < q[i + 1]:
+                    q[i] = parabolic
+                else:
+                    q[i] = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    def _order_statistic(self, k: int) -> float:
+        """Returns the k-th smallest value (1-indexed) held in the histogram."""
+        seen = 0
+        for value in sorted(self.histogram):
+            seen += self.histogram[value]
+            if seen >= k:
+                return value
+
+    def _start_estimation(self):
+        count = self.count
+        self.desired = [1.0, 1 + (count - 1) * self.p / 2, 1 + (count - 1) * self.p, 1 + (count - 1) * (1 + self.p) / 2, float(count)]
+        positions = [1]
+        for desired in self.desired[1:4]:
+            positions.append(min(max(round(desired), positions[-1] + 1), count - (4 - len(positions))))
+        positions.append(count)
+        self.positions = positions
+        self.heights = [float(self._order_statistic(k)) for k in positions]
+        self.histogram = None
+
+    def get_quantile(self) -> float:
+        """
+        Returns the quantile of the values seen so far (interpolated like `np.quantile` while it is exact).
+        """
+        if self.count == 0:
+            return float("nan")
+        if self.histogram is None:
+            return self.heights[2]
+        rank = (self.count - 1) * self.p
+        lower = self._order_statistic(int(rank) + 1)
+        upper = self._order_statistic(min(int(rank) + 2, self.count))
+        return lower + (upper - lower) * (rank - int(rank))
+
+    def is_exact(self) -> bool: return self.histogram is not None
+
+
+class StreamingStats:
+    """
+    Online accumulator of the count, mean, standard deviation (Welford's algorithm), min, max and median of a stream
+    of values, using constant memory.
+    """
+    def __init__(self, max_distinct: int = 10000):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.median = StreamingQuantile(0.5, max_distinct)
+
+    def update(self, x: float):
+        self.count += 1
+        self.total += x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = x if self.min is None or x < self.min else self.min
+        self.max = x if self.max is None or x > self.max else self.max
+        self.median.update(x)
+
+    def get_count(self) -> int: return self.count
+    def get_mean(self) -> float: return self.total / self.count if self.count else float("nan")
+    def get_min(self) -> float: return self.min
+    def get_max(self) -> float: return self.max
+    def get_median(self) -> float: return self.median.get_quantile()
+
+    def get_std(self, ddof: int = 1) -> float:
+        if self.count - ddof <= 0:
+            return float("nan")
+        return math.sqrt(self.m2 / (self.count - ddof))
+
+    def as_dict(self) -> dict[str, float]:
+        """
+        Returns the statistics in the same form as `calc_stats`.
+        """
+        return {
+            'min': round(float(self.get_min()), 3),
+            'max': round(float(self.get_max()), 3),
+            'median': round(float(self.get_median()), 3),
+            'mean': round(float(self.get_mean()), 3),
+            'std_dev': round(float(self.get_std(ddof=0)), 3)
+        }
+
+
+class BoundedExtremes:
+    """
+    Keeps the `k` items with the highest keys and the `k` items with the lowest keys out of a stream of (key, item)
+    pairs using two bounded heaps. Ties are resolved as a stable sort of the whole stream would resolve them: the lowest
+    keys favor items pushed earlier and the highest keys favor items pushed later.
+    """
+    def __init__(self, k: int = 5):
+        self.k = k
+        self.seq = 0
+        self.highest = []
+        self.lowest = []
+
+    def push(self, key: float, item: Any):
+        entry = (key, self.seq, item)
+        self.seq += 1
+        if len(self.highest) < self.k:
+            heapq.heappush(self.highest, (key, entry[1], entry))
+        elif (key, entry[1]) > self.highest[0][:2]:
+            heapq.heapreplace(self.highest, (key, entry[1], entry))
+        if len(self.lowest) < self.k:
+            heapq.heappush(self.lowest, (-key, -entry[1], entry))
+        elif (-key, -entry[1]) > self.lowest[0][:2]:
+            heapq.heapreplace(self.lowest, (-key, -entry[1], entry))
+
+    def __len__(self) -> int: return self.seq
+
+    def get_highest(self) -> list[Any]:
+        """Returns the items with the highest keys, from highest to lowest."""
+        return [entry[2] for _, _, entry in sorted(self.highest, key=lambda e: e[:2], reverse=True)]
+
+    def get_lowest(self) -> list[Any]:
+        """Returns the items with the lowest keys, from lowest to highest."""
+        return [entry[2] for _, _, entry in sorted(self.lowest, key=lambda e: e[:2], reverse=True)]
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 import matplotlib.pyplot as plt
 import networkx as nx
 import tabulate
@@ -26,7 +27,8 @@ def visualize_scenario(
         ax: plt.Axes = None,
         arc_rads_scale: float = DEFAULT_ARC,
         transparent: bool = False,
-        figure_directory: str = None
+        figure_directory: str = None,
+        tight_layout: bool = True
 ) -> None:
     """
     A function that visualizes a given `scenario` (and optionally an `assignment` of agents to targets within the context of that `scenario`).
@@ -41,6 +43,8 @@ def visualize_scenario(
         arc_rads_scale (float): A scalar factor that determines how much the edges between non-adjacent
             agents should be arced.
         figure_directory (str): The directory where the figure should be saved. If None, the figure will not be saved.
+        tight_layout (bool): Determines whether (True) or not (False) `plt.tight_layout` is applied after drawing. When
+            drawing many scenarios onto one figure, it is enough to apply it to the figure once at the end.
     """
 
     G = scenario.get_graph_copy()
@@ -57,13 +61,7 @@ def visualize_scenario(
     rad = arc_rads_scale * (agent_count / 5)
     pseudo_targets = {target: agent_count + target for target in range(1, target_count + 1)}
     G.add_nodes_from(pseudo_targets.values())
-    pos_top = {agent: (agent - 1, 0.1) for agent in range(1, agent_count + 1)}
-    pos_bottom = {pseudo_targets[i]: (i - 1, -0.2) for i in range(1, target_count + 1)}
-    x_coords_top = [pos_top[agent][0] for agent in pos_top]
-    center_x_top = sum(x_coords_top) / len(x_coords_top)
-    shift_x = center_x_top - (len(pos_bottom) - 1) / 2 
-    pos_bottom_centered = {target: (pos_bottom[target][0] + shift_x, pos_bottom[target][1]) for target in pos_bottom}
-    pos = {**pos_top, **pos_bottom_centered} 
+    pos = _node_positions(agent_count, target_count)
 
     # Draw agent graph
     nx.draw_networkx_nodes(G, pos, nodelist=range(1, agent_count + 1), ax=ax, node_color='lightblue', node_size=node_size)
@@ -113,7 +111,8 @@ def visualize_scenario(
     
     ax.set_ylim(-0.6, 0.4)
     ax.axis('off')
-    plt.tight_layout()
+    if tight_layout:
+        plt.tight_layout()
 
     if figure_directory:
         os.makedirs(figure_directory, exist_ok=True)
@@ -122,6 +121,21 @@ def visualize_scenario(
         #print(f"Visualization saved to [{save_path}]")
         plt.close()
 
+@lru_cache(maxsize=None)
+def _node_positions(agent_count: int, target_count: int) -> dict[int, tuple[float, float]]:
+    """
+    Returns the positions of the agents (top row) and pseudo target nodes (bottom row, centered under the agents). They
+    only depend on the number of agents and targets, so they are computed once and shared by every scenario of that
+    size. The returned dictionary must not be modified.
+    """
+    pos_top = {agent: (agent - 1, 0.1) for agent in range(1, agent_count + 1)}
+    pos_bottom = {agent_count + i: (i - 1, -0.2) for i in range(1, target_count + 1)}
+    x_coords_top = [pos_top[agent][0] for agent in pos_top]
+    center_x_top = sum(x_coords_top) / len(x_coords_top)
+    shift_x = center_x_top - (len(pos_bottom) - 1) / 2 
+    pos_bottom_centered = {target: (pos_bottom[target][0] + shift_x, pos_bottom[target][1]) for target in pos_bottom}
+    return {**pos_top, **pos_bottom_centered}
+
 def visualize_assignment_comparison(
         scenario: Scenario,
         assignment_list: list[Assignment],
@@ -138,7 +152,7 @@ def visualize_assignment_comparison(
         figure_directory (str): The directory where the figures should be saved. If None, the figures will not be saved.
     """
 
-    G = scenario.get_graph_copy()
+    G = scenario.get_graph()
     target_values = scenario.get_target_values()
 
     # Compute optimal solution for comparison
@@ -171,10 +185,10 @@ def visualize_best_worst_scenarios(
         algorithm_title: str,
         output_dir: str,
         arc_rads_scale: float = DEFAULT_ARC
-) -> None:
+) -> str:
     """
     A visualization function to be used in conjunction with a simulation. Visualizes the five best and five worst scenarios
-    for a given algorithm.
+    for a given algorithm and returns the path of the saved figure.
     """
     best_titles = ["Best", "2nd Best", "3rd Best", "4th Best", "5th Best"]
     worst_titles = ["Worst", "2nd Worst", "3rd Worst", "4th Worst", "5th Worst"]
@@ -190,7 +204,8 @@ def visualize_best_worst_scenarios(
             metric="efficiency",
             metric_value=round(efficiency, 3),
             ax=axes[0][index],
-            arc_rads_scale=arc_rads_scale
+            arc_rads_scale=arc_rads_scale,
+            tight_layout=False
         )
         s, a = worst[index]
         efficiency = a.get_efficiency()
@@ -201,7 +216,8 @@ def visualize_best_worst_scenarios(
             metric="efficiency",
             metric_value=round(efficiency, 3),
             ax=axes[1][index],
-            arc_rads_scale=arc_rads_scale
+            arc_rads_scale=arc_rads_scale,
+            tight_layout=False
         )
     
     visual_title = f"{algorithm_title} on {scenario_type}"
@@ -212,4 +228,5 @@ def visualize_best_worst_scenarios(
     save_path = os.path.join(output_dir, f"bw_{visual_title.replace(' ','')}.png")
     plt.savefig(save_path)
     plt.close()
+    return save_path
         
\ No newline at end of file